@@ -0,0 +1,163 @@
+import pygame
+import os
+import threading
+from collections import OrderedDict
+from settings import *
+from sprite_atlas import SpriteAtlas
+
+class LRUCache:
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return self.entries[key]
+        self.misses += 1
+        return None
+
+    def put(self, key, value):
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self.entries.clear()
+
+    def stats(self):
+        return {
+            "entries": len(self.entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+class AssetCache:
+    """Process-wide cache of decoded and transformed images.
+
+    Returned surfaces are shared between every sprite that asks for them,
+    so callers must copy a surface before drawing onto it or changing its alpha.
+    Everything except ``preload`` must be called from the main thread; the
+    LRU is only touched under ``lock`` so preload can look into it safely.
+    """
+
+    def __init__(self, max_entries=ASSET_CACHE_SIZE):
+        self.cache = LRUCache(max_entries)
+        self.atlas = None
+        self.decoded = {}  # path -> image decoded by preload, not converted yet
+        self.lock = threading.Lock()
+
+    def load_atlas(self, index_path):
+        if not os.path.exists(index_path):
+            print(f"Sprite atlas not found at {index_path}, loading sprites from the original images.")
+            return
+        try:
+            self.atlas = SpriteAtlas(index_path)
+            print(f"Loaded sprite atlas: {index_path} ({len(self.atlas.entries)} entries)")
+        except (OSError, ValueError, KeyError, pygame.error) as e:
+            print(f"Warning: Could not load sprite atlas: {e}")
+            self.atlas = None
+
+    def get_image(self, path, size=None, scale=None, flip=False, tint=None, alpha=True):
+        key = ('image', path, size, scale, flip, tint, alpha)
+        with self.lock:
+            image = self.cache.get(key)
+        if image is None and self.atlas:
+            image = self.atlas.get(key)
+            if image is not None:
+                self.put(key, image)
+        if image is None:
+            if size is None and scale is None and not flip and tint is None:
+                image = self.load(path, alpha)
+            else:
+                source = self.get_image(path, alpha=alpha)
+                image = self.transform(source, size, scale, flip, tint)
+            self.put(key, image)
+        return image
+
+    def get_frames(self, path, num_frames, count=None, size=None, scale=None, flip=False, tint=None):
+        """Slice a horizontal sprite sheet into frames and transform each frame.
+
+        ``count`` keeps only the first frames of the sheet, ``size`` scales every
+        frame to an exact size and ``scale`` multiplies the frame size instead.
+        """
+        key = ('frames', path, num_frames, count, size, scale, flip, tint)
+        with self.lock:
+            frames = self.cache.get(key)
+        if frames is None and self.atlas:
+            frames = self.atlas.get(key)
+            if frames is not None:
+                self.put(key, frames)
+        if frames is None:
+            sheet = self.get_image(path)
+            frame_width = sheet.get_width() // num_frames
+            frame_height = sheet.get_height()
+            frames = tuple(
+                self.transform(sheet.subsurface((i * frame_width, 0, frame_width, frame_height)),
+                               size, scale, flip, tint)
+                for i in range(count if count is not None else num_frames)
+            )
+            self.put(key, frames)
+        return frames
+
+    def put(self, key, value):
+        with self.lock:
+            self.cache.put(key, value)
+
+    def preload(self, path):
+        """Decode an image file ahead of time, safe to call from a worker thread.
+
+        Converting to the display format still happens on the main thread when
+        the image is first requested, which is cheap compared to decoding.
+        Images the atlas serves, or that already have cached surfaces, are skipped.
+        """
+        if self.atlas and path in self.atlas.sources:
+            return
+        with self.lock:
+            if path in self.decoded or any(key[1] == path for key in self.cache.entries):
+                return
+        image = pygame.image.load(path)
+        with self.lock:
+            self.decoded[path] = image
+
+    def load(self, path, alpha=True):
+        with self.lock:
+            image = self.decoded.pop(path, None)
+        if image is None:
+            image = pygame.image.load(path)
+        return image.convert_alpha() if alpha else image.convert()
+
+    def transform(self, surface, size=None, scale=None, flip=False, tint=None):
+        if scale is not None:
+            size = (int(surface.get_width() * scale), int(surface.get_height() * scale))
+        if size is not None:
+            surface = pygame.transform.scale(surface, size)
+        if flip:
+            surface = pygame.transform.flip(surface, True, False)
+        if tint is not None:
+            surface = surface.copy()
+            surface.fill(tint, special_flags=pygame.BLEND_RGB_MULT)
+        return surface
+
+    def drop_preloaded(self):
+        # Decoded images nobody asked for while the level was built would otherwise stay forever
+        with self.lock:
+            self.decoded.clear()
+
+    def clear(self):
+        with self.lock:
+            self.cache.clear()
+            self.decoded.clear()
+
+    def stats(self):
+        return self.cache.stats()
+
+asset_cache = AssetCache()
@@ -0,0 +1,203 @@
+"""Frame-time benchmark for the game loop.
+
+For every level file the benchmark force-spawns monsters of each type, plays a
+scripted input loop on a fixed game clock under the SDL dummy drivers and
+times Level.update and Level.draw separately. Results are printed as JSON and
+can be saved as, or compared against, a baseline:
+
+    python benchmark.py --monsters 20 --save-baseline bench_baseline.json
+    python benchmark.py --monsters 20 --baseline bench_baseline.json
+"""
+import os
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import argparse
+import contextlib
+import glob
+import io
+import json
+import sys
+import time
+import tracemalloc
+import pygame
+from settings import *
+from simulate import HeadlessSimulation, init_headless
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+MONSTER_TYPES = ['Monster', 'RangedMonster', 'EnhancedMonster']
+COMPARED_METRICS = ['update_ms', 'draw_ms']
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+def summarize(values):
+    return {
+        'p50': round(percentile(values, 0.50), 4),
+        'p95': round(percentile(values, 0.95), 4),
+        'p99': round(percentile(values, 0.99), 4),
+        'max': round(max(values), 4) if values else 0.0,
+    }
+
+def peak_rss_kb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+def create_simulation(level_file, monsters_per_type, render_mode, seed, monster_backend=None):
+    simulation = HeadlessSimulation(level_file, seed=seed)
+    level = simulation.level
+    if monster_backend == 'numpy' and level.spawn_director.batch is None:
+        level.spawn_director.enable_batch()
+    elif monster_backend == 'sprites':
+        level.spawn_director.batch = None
+    if render_mode == 'dirty':
+        from renderer import DirtyRectRenderer
+        level.renderer = DirtyRectRenderer(level.erase_background)
+    elif render_mode == 'full':
+        level.renderer = None
+
+    # Spread the forced monsters across the screen
+    count = monsters_per_type * len(MONSTER_TYPES)
+    for i in range(count):
+        monster_type = MONSTER_TYPES[i % len(MONSTER_TYPES)]
+        x = int((i + 0.5) * WINDOW_WIDTH / count)
+        level.spawn_monster({'type': monster_type, 'x': x, 'y': 300})
+    return simulation
+
+def run_scenario(level_file, monsters_per_type, frames, warmup, render_mode, seed, monster_backend=None):
+    screen = pygame.display.get_surface()
+    simulation = create_simulation(level_file, monsters_per_type, render_mode, seed, monster_backend)
+    level = simulation.level
+    clock = simulation.clock
+    step_seconds = simulation.step_ms / 1000
+
+    update_times = []
+    draw_times = []
+    for frame in range(warmup + frames):
+        clock.advance(simulation.step_ms)
+        start = time.perf_counter()
+        level.update(step_seconds)
+        middle = time.perf_counter()
+        level.draw(screen)
+        end = time.perf_counter()
+        if frame >= warmup:
+            update_times.append((middle - start) * 1000)
+            draw_times.append((end - middle) * 1000)
+
+    # Allocations are measured in a separate pass, tracemalloc slows everything down
+    allocation_frames = min(frames, 120)
+    allocated_bytes = []
+    allocated_blocks = []
+    tracemalloc.start()
+    for _ in range(allocation_frames):
+        clock.advance(simulation.step_ms)
+        blocks_before = sys.getallocatedblocks()
+        tracemalloc.reset_peak()
+        traced_before = tracemalloc.get_traced_memory()[0]
+        level.update(step_seconds)
+        level.draw(screen)
+        allocated_bytes.append(tracemalloc.get_traced_memory()[1] - traced_before)
+        allocated_blocks.append(sys.getallocatedblocks() - blocks_before)
+    tracemalloc.stop()
+
+    result = {
+        'level': level_file,
+        'monsters_per_type': monsters_per_type,
+        'monsters_alive': len(level.monsters),
+        'frames': frames,
+        'update_ms': summarize(update_times),
+        'draw_ms': summarize(draw_times),
+        'frame_ms': summarize([u + d for u, d in zip(update_times, draw_times)]),
+        # Peak of memory allocated while a frame runs, and net Python blocks kept per frame
+        'alloc_peak_bytes_per_frame': summarize(allocated_bytes),
+        'net_blocks_per_frame': round(sum(allocated_blocks) / len(allocated_blocks), 2) if allocated_blocks else 0,
+    }
+    simulation.close()
+    return result
+
+def scenario_key(results, entry):
+    # Results are only comparable for the same level, monster count, render mode and backend
+    return (entry['level'], entry['monsters_per_type'],
+            results.get('render_mode'), results.get('monster_backend', 'sprites'))
+
+def compare(results, baseline, tolerance):
+    """Return a list of regressions: p95 times slower than the baseline by more than ``tolerance``."""
+    regressions = []
+    baseline_by_key = {scenario_key(baseline, entry): entry for entry in baseline.get('scenarios', [])}
+    for entry in results['scenarios']:
+        key = scenario_key(results, entry)
+        reference = baseline_by_key.get(key)
+        if reference is None:
+            print("Warning: no baseline for {} with {} monsters per type, {} rendering and the {} backend, "
+                  "not compared".format(*key), file=sys.stderr)
+            continue
+        for metric in COMPARED_METRICS:
+            current = entry[metric]['p95']
+            previous = reference[metric]['p95']
+            if previous > 0 and current > previous * (1 + tolerance):
+                regressions.append({
+                    'level': entry['level'],
+                    'metric': f"{metric}.p95",
+                    'baseline': previous,
+                    'current': current,
+                    'change': f"{(current / previous - 1) * 100:+.1f}%",
+                })
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Level.update and Level.draw.")
+    parser.add_argument('--levels', nargs='*', default=sorted(glob.glob('assets/levels/*.json')))
+    parser.add_argument('--monsters', type=int, default=5, help="monsters spawned per monster type")
+    parser.add_argument('--frames', type=int, default=300)
+    parser.add_argument('--warmup', type=int, default=30)
+    parser.add_argument('--render-mode', choices=['full', 'dirty'], default=RENDER_MODE)
+    parser.add_argument('--monster-backend', choices=['sprites', 'numpy'], default=MONSTER_BACKEND)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--output', help="write the JSON results to this file as well")
+    parser.add_argument('--baseline', help="compare against a previously saved result file")
+    parser.add_argument('--save-baseline', help="save the results as a new baseline")
+    parser.add_argument('--tolerance', type=float, default=0.15, help="allowed p95 slowdown, 0.15 = 15%%")
+    args = parser.parse_args()
+
+    init_headless()
+    scenarios = []
+    for level_file in args.levels:
+        with contextlib.redirect_stdout(io.StringIO()):
+            scenarios.append(run_scenario(level_file, args.monsters, args.frames, args.warmup,
+                                          args.render_mode, args.seed, args.monster_backend))
+    results = {
+        'render_mode': args.render_mode,
+        'monster_backend': args.monster_backend,
+        'peak_rss_kb': peak_rss_kb(),
+        'scenarios': scenarios,
+    }
+
+    exit_code = 0
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            results['regressions'] = compare(results, json.load(f), args.tolerance)
+        if results['regressions']:
+            exit_code = 1
+
+    text = json.dumps(results, indent=2)
+    print(text)
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, 'w') as f:
+                f.write(text)
+    pygame.quit()
+    sys.exit(exit_code)
+
+if __name__ == "__main__":
+    main()
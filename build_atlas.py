@@ -0,0 +1,65 @@
+"""Offline sprite atlas builder.
+
+Loads every level under the dummy video driver and spawns each monster type, so
+the asset cache ends up holding exactly the frames the game asks for at runtime
+(same slicing, scale, flip and tint). Those frames, plus their mirrored
+variants, are packed into one texture that the game maps in with a single read.
+
+    python build_atlas.py [--levels assets/levels/*.json] [--output assets/atlas/sprites.json]
+"""
+import os
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import argparse
+import glob
+import pygame
+from settings import *
+from asset_cache import asset_cache
+from level_compiler import MONSTER_TYPES
+
+def collect_entries(level_files, include_flipped=True):
+    from level import Level
+
+    # Keep everything the levels request, the runtime limit does not apply here
+    asset_cache.cache.max_entries = 1 << 30
+    for level_file in level_files:
+        level = Level(level_file)
+        for monster_type in MONSTER_TYPES:
+            level.spawn_monster({'type': monster_type, 'x': 0, 'y': 0})
+        level.cleanup()
+
+    entries = {}
+    for key, value in list(asset_cache.cache.entries.items()):
+        kind, path = key[0], key[1]
+        if kind == 'frames':
+            entries[key] = (key, path, kind, value)
+            flip_key = key[:6] + (not key[6],) + key[7:]
+            if include_flipped and flip_key not in entries:
+                entries[flip_key] = (flip_key, path, kind, asset_cache.get_frames(path, *flip_key[2:]))
+        elif kind == 'image':
+            size, scale, alpha = key[2], key[3], key[6]
+            # Full-screen images and untransformed sources are not worth packing
+            if (size or scale) and alpha and max(value.get_size()) <= ATLAS_MAX_SPRITE_SIZE:
+                entries[key] = (key, path, kind, (value,))
+    return list(entries.values())
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the pre-scaled sprite atlas.")
+    parser.add_argument('--levels', nargs='*', default=sorted(glob.glob('assets/levels/*.json')))
+    parser.add_argument('--output', default=SPRITE_ATLAS_PATH)
+    parser.add_argument('--no-flip', action='store_true', help="do not pack mirrored frames")
+    args = parser.parse_args()
+
+    pygame.init()
+    pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+
+    from sprite_atlas import write_atlas
+    entries = collect_entries(args.levels, include_flipped=not args.no_flip)
+    width, height = write_atlas(args.output, entries)
+    frame_count = sum(len(surfaces) for _, _, _, surfaces in entries)
+    print(f"Wrote {args.output}: {len(entries)} entries, {frame_count} frames, {width}x{height} texture")
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+import pygame
+from settings import *
+
+class Camera:
+    """Viewport into a level that can be larger than the window.
+
+    ``rect`` is the visible part of the world in world coordinates; sprites keep
+    world coordinates and are shifted by ``offset`` when drawn.
+    """
+
+    def __init__(self, world_rect, view_size=(WINDOW_WIDTH, WINDOW_HEIGHT)):
+        self.world_rect = world_rect
+        self.rect = pygame.Rect((0, 0), view_size)
+        self.moved = True  # Whether the view changed since the previous frame
+
+    @property
+    def offset(self):
+        return (-self.rect.x, -self.rect.y)
+
+    def follow(self, target_rect):
+        previous = self.rect.topleft
+        self.rect.center = target_rect.center
+        self.rect.clamp_ip(self.world_rect)
+        self.moved = self.rect.topleft != previous
+
+    def apply(self, rect):
+        # World rect -> screen rect
+        return rect.move(-self.rect.x, -self.rect.y)
+
+    def to_world(self, rect):
+        # Screen rect -> world rect
+        return rect.move(self.rect.x, self.rect.y)
+
+    def is_visible(self, rect):
+        return self.rect.colliderect(rect)
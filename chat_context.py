@@ -0,0 +1,119 @@
+import threading
+from settings import *
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+MESSAGE_OVERHEAD = 4  # Tokens the chat format adds around every message
+
+class TokenCounter:
+    """Counts tokens with tiktoken when it is installed, otherwise estimates ~4 characters per token."""
+
+    def __init__(self, model=CHAT_MODEL):
+        self.encoding = None
+        if tiktoken is not None:
+            try:
+                self.encoding = tiktoken.encoding_for_model(model)
+            except KeyError:
+                self.encoding = tiktoken.get_encoding("cl100k_base")
+
+    def count(self, text):
+        if self.encoding is not None:
+            return len(self.encoding.encode(text))
+        return len(text) // 4 + 1
+
+class ConversationContext:
+    """Chat history kept within a token budget.
+
+    The system prompt message and its token count are built once and reused as
+    the prefix of every request. When the prompt would exceed the budget, the
+    oldest turns are removed and, if a summarizer is given, folded into a
+    running summary that is sent right after the system prompt.
+    """
+
+    def __init__(self, system_prompt, token_budget=CHAT_TOKEN_BUDGET, keep_recent=CHAT_KEEP_RECENT_MESSAGES,
+                 summarizer=None):
+        self.counter = TokenCounter()
+        self.system_message = {"role": "system", "content": system_prompt}
+        self.system_tokens = self.counter.count(system_prompt) + MESSAGE_OVERHEAD
+        self.token_budget = token_budget
+        self.keep_recent = keep_recent
+        self.summarizer = summarizer  # summarizer(previous summary, dropped messages) -> new summary
+        self.messages = []
+        self.message_tokens = []
+        self.summary = ""
+        self.summary_message = None
+        self.summary_tokens = 0
+        self.last_prompt_tokens = 0
+        self.generation = 0  # Bumped whenever old messages are dropped or the summary changes
+        self.lock = threading.Lock()
+
+    def add(self, role, content):
+        with self.lock:
+            self.messages.append({"role": role, "content": content})
+            self.message_tokens.append(self.counter.count(content) + MESSAGE_OVERHEAD)
+
+    def remove_last(self, role):
+        # Drops the newest message if it has the given role
+        with self.lock:
+            if self.messages and self.messages[-1]["role"] == role:
+                self.messages.pop()
+                self.message_tokens.pop()
+
+    def prompt_tokens(self):
+        return self.system_tokens + self.summary_tokens + sum(self.message_tokens)
+
+    def build_messages(self):
+        """Compact the history if needed and return the messages for the next request.
+
+        May call the summarizer, so it should run off the main thread. The lock
+        is not held while summarizing, so ``add`` never waits on it. A summary
+        is only installed if no newer request compacted the history meanwhile,
+        so a cancelled worker finishing late cannot overwrite a newer summary.
+        """
+        with self.lock:
+            dropped = self.drop_old()
+            summary = self.summary
+            generation = self.generation
+        if dropped and self.summarizer:
+            summary = self.summarize(summary, dropped)
+            if summary:
+                with self.lock:
+                    if self.generation == generation:
+                        self.set_summary(summary)
+        with self.lock:
+            messages = [self.system_message]
+            if self.summary_message:
+                messages.append(self.summary_message)
+            messages.extend(self.messages)
+            self.last_prompt_tokens = self.prompt_tokens()
+            return messages
+
+    def drop_old(self):
+        dropped = []
+        while self.prompt_tokens() > self.token_budget and len(self.messages) > self.keep_recent:
+            dropped.append(self.messages.pop(0))
+            self.message_tokens.pop(0)
+        if dropped:
+            self.generation += 1
+        return dropped
+
+    def summarize(self, summary, dropped):
+        try:
+            summary = self.summarizer(summary, dropped)
+        except Exception as e:
+            print(f"Warning: Could not summarize the conversation, dropping old messages: {e}")
+            return None
+        if summary and self.counter.count(summary) > CHAT_SUMMARY_MAX_TOKENS:
+            # Never let the summary itself grow past its share of the budget
+            summary = summary[-CHAT_SUMMARY_MAX_TOKENS * 4:]
+        return summary
+
+    def set_summary(self, summary):
+        self.generation += 1
+        self.summary = summary
+        content = f"Summary of the earlier conversation: {summary}"
+        self.summary_message = {"role": "system", "content": content}
+        self.summary_tokens = self.counter.count(content) + MESSAGE_OVERHEAD
@@ -3,31 +3,36 @@ import pygame_gui
 from settings import *
 from openai import OpenAI
 import os
+import queue
+import threading
+import time
+from asset_cache import asset_cache
+from text_cache import text_cache
+from chat_context import ConversationContext
+from response_cache import response_cache, CacheMiss
 
 class ChatTerminal(pygame.sprite.Sprite):
     def __init__(self, position, groups, screen):
         super().__init__(groups)
         try:
-            self.image = pygame.image.load(CHAT_TERMINAL_IMAGE).convert_alpha()
-            self.image = pygame.transform.scale(self.image, (50, 50))  # Adjust size as needed
+            self.image = asset_cache.get_image(CHAT_TERMINAL_IMAGE, size=(50, 50))  # Adjust size as needed
         except pygame.error:
             print(f"Warning: Could not load chat terminal image: {CHAT_TERMINAL_IMAGE}")
             self.image = pygame.Surface((50, 50))
             self.image.fill((0, 255, 255))  # Cyan color as a placeholder
         self.rect = self.image.get_rect(topleft=position)
         
-        self.font = pygame.font.Font(None, 24)
-        self.prompt_text = self.font.render("Press F to chat", True, (255, 255, 255))
+        self.prompt_text = text_cache.render("Press F to chat", 24, (255, 255, 255))
         self.prompt_rect = self.prompt_text.get_rect()
         
         self.screen = screen
         self.chat_interface = ChatInterface(self.screen)
         self.chat_active = False
 
-    def draw_prompt(self, surface, player):
+    def draw_prompt(self, surface, player, offset=(0, 0)):
         if self.rect.colliderect(player.rect.inflate(20, 20)):
             self.prompt_rect.midbottom = (self.rect.centerx, self.rect.top - 10)
-            surface.blit(self.prompt_text, self.prompt_rect)
+            return surface.blit(self.prompt_text, self.prompt_rect.move(offset))
 
     def interact(self, level):
         print("ChatTerminal: Opening chat interface")
@@ -86,7 +91,24 @@ class ChatInterface:
             print(f"Warning: Error initializing OpenAI client: {e}")
             self.client = None
 
-        self.conversation_history = []
+        self.context = ConversationContext(
+            CHAT_SYSTEM_PROMPT,
+            summarizer=self.summarize_messages if CHAT_SUMMARIZE and (self.client or response_cache.replay_only) else None
+        )
+        self.history_html = ""
+
+        # Streaming request state, filled by the worker thread through self.response_queue
+        self.response_queue = queue.Queue()
+        self.request_thread = None
+        self.cancel_event = None
+        self.pending_response = None  # Text streamed so far, None when no request is running
+        self.request_started = None
+        self.first_token_time = None
+        self.chunk_count = 0
+        self.prompt_tokens = None
+        self.history_dirty = False
+        self.last_refresh = 0
+        self.request_metrics = []  # One entry per finished request
 
     def handle_event(self, event):
         if event.type == pygame.USEREVENT:
@@ -94,6 +116,7 @@ class ChatInterface:
                 if event.ui_element == self.send_button:
                     self.send_message()
                 elif event.ui_element == self.close_button:
+                    self.cancel_request()
                     return 'close_chat'
         
         self.manager.process_events(event)
@@ -101,39 +124,186 @@ class ChatInterface:
 
     def send_message(self):
         message = self.input_field.get_text()
-        if message:
-            self.chat_history.html_text += f"<br><b>You:</b> {message}"
-            self.chat_history.rebuild()
+        if message and not self.is_busy():
+            self.history_html += f"<br><b>You:</b> {message}"
             self.input_field.set_text("")
-            
-            # Here you would integrate with your AI model to generate a response
-            ai_response = self.get_ai_response(message)
-            self.chat_history.html_text += f"<br><b>AI:</b> {ai_response}"
-            self.chat_history.rebuild()
-
-    def get_ai_response(self, message):
-        self.conversation_history.append({"role": "user", "content": message})
-        
-        if not self.client:
-            return "AI is currently unavailable. Please try again later."
+            self.start_request(message)
+            self.refresh_history()
+
+    def is_busy(self):
+        return self.pending_response is not None
+
+    def start_request(self, message):
+        self.context.add("user", message)
+        self.pending_response = ""
+        self.request_started = time.perf_counter()
+        self.first_token_time = None
+        self.chunk_count = 0
+        self.prompt_tokens = None
+
+        if not self.client and not response_cache.replay_only:
+            self.response_queue.put(('error', "AI is currently unavailable. Please try again later."))
+            return
 
+        # Each request gets its own queue and cancel flag, so a cancelled worker
+        # that is still winding down cannot leak tokens into the next answer
+        self.response_queue = queue.Queue()
+        self.cancel_event = threading.Event()
+        self.request_thread = threading.Thread(
+            target=self.stream_ai_response,
+            args=(self.response_queue, self.cancel_event),
+            daemon=True
+        )
+        self.request_thread.start()
+
+    def stream_ai_response(self, response_queue, cancel_event):
+        # Runs on the worker thread: only talks to the main thread through response_queue
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "You are an AI assistant in a space survival horror game. Provide information and guidance to the player."},
-                    *self.conversation_history
-                ]
-            )
+            # Cancelling is checked before every paid call: the summary, if any, and the answer
+            if self.was_cancelled(response_queue, cancel_event):
+                return
+            messages = self.context.build_messages()
+            if self.was_cancelled(response_queue, cancel_event):
+                return
+            response_queue.put(('prompt_tokens', self.context.last_prompt_tokens))
+            key = response_cache.key('chat', CHAT_MODEL, messages)
+            cached = response_cache.get_text(key)
+            if cached is not None:
+                response_queue.put(('token', cached))
+                response_queue.put(('done', None))
+                return
 
-            ai_response = response.choices[0].message.content
-            self.conversation_history.append({"role": "assistant", "content": ai_response})
-            return ai_response
+            if self.was_cancelled(response_queue, cancel_event):
+                return
+            stream = self.client.chat.completions.create(
+                model=CHAT_MODEL,
+                messages=messages,
+                stream=True
+            )
+            parts = []
+            try:
+                for chunk in stream:
+                    if cancel_event.is_set():
+                        break
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        parts.append(chunk.choices[0].delta.content)
+                        response_queue.put(('token', parts[-1]))
+            finally:
+                stream.close()
+            if cancel_event.is_set():
+                response_queue.put(('cancelled', None))
+            else:
+                response_cache.put_text(key, "".join(parts))
+                response_queue.put(('done', None))
+        except CacheMiss as e:
+            print(f"ChatInterface: {e}")
+            response_queue.put(('error', "AI is offline and has no recorded answer to this. Please try something else."))
         except Exception as e:
             print(f"Error getting AI response: {e}")
-            return "Sorry, I couldn't process your request. Please try again."
+            response_queue.put(('error', "Sorry, I couldn't process your request. Please try again."))
+
+    def was_cancelled(self, response_queue, cancel_event):
+        if cancel_event.is_set():
+            response_queue.put(('cancelled', None))
+            return True
+        return False
+
+    def summarize_messages(self, summary, messages):
+        # Called from the worker thread when old messages no longer fit the token budget
+        transcript = "\n".join(f"{message['role']}: {message['content']}" for message in messages)
+        prompt = [
+            {"role": "system", "content": "Summarize this conversation between a player and the station AI "
+                                          "in a few sentences. Keep the facts the AI should remember."},
+            {"role": "user", "content": f"Earlier summary: {summary or 'none'}\n\n{transcript}"}
+        ]
+        key = response_cache.key('chat_summary', CHAT_MODEL, prompt, {'max_tokens': CHAT_SUMMARY_MAX_TOKENS})
+        cached = response_cache.get_text(key)
+        if cached is not None:
+            return cached
+
+        response = self.client.chat.completions.create(
+            model=CHAT_MODEL,
+            messages=prompt,
+            max_tokens=CHAT_SUMMARY_MAX_TOKENS
+        )
+        text = response.choices[0].message.content
+        response_cache.put_text(key, text)
+        return text
+
+    def cancel_request(self):
+        if self.cancel_event:
+            self.cancel_event.set()
+        if self.is_busy():
+            self.finish_request('cancelled', self.pending_response + " <i>[cancelled]</i>")
+
+    def finish_request(self, status, text):
+        latency = time.perf_counter() - self.request_started
+        metrics = {
+            "status": status,
+            "latency_ms": round(latency * 1000, 1),
+            "first_token_ms": round((self.first_token_time - self.request_started) * 1000, 1)
+            if self.first_token_time else None,
+            "chunks": self.chunk_count,
+            "prompt_tokens": self.prompt_tokens,
+        }
+        self.request_metrics.append(metrics)
+        print(f"ChatInterface: request {status} in {metrics['latency_ms']} ms "
+              f"(first token {metrics['first_token_ms']} ms, {metrics['chunks']} chunks, "
+              f"prompt {metrics['prompt_tokens']} tokens)")
+
+        if status == 'done':
+            self.context.add("assistant", text)
+        elif status == 'cancelled' and self.pending_response:
+            self.context.add("assistant", self.pending_response)  # What the player saw of the answer
+        else:
+            # No answer to pair the message with, so it is not sent again with the next request
+            self.context.remove_last("user")
+        self.history_html += f"<br><b>AI:</b> {text}"
+        self.pending_response = None
+        self.cancel_event = None
+        self.request_thread = None
+        self.refresh_history()
+
+    def process_responses(self):
+        while self.is_busy():
+            try:
+                kind, value = self.response_queue.get_nowait()
+            except queue.Empty:
+                break
+            if kind == 'token':
+                if self.first_token_time is None:
+                    self.first_token_time = time.perf_counter()
+                self.pending_response += value
+                self.chunk_count += 1
+                self.history_dirty = True
+            elif kind == 'prompt_tokens':
+                self.prompt_tokens = value
+            elif kind == 'done':
+                self.finish_request('done', self.pending_response)
+            elif kind == 'cancelled':
+                self.finish_request('cancelled', self.pending_response + " <i>[cancelled]</i>")
+            elif kind == 'error':
+                self.finish_request('error', value)
+
+    def refresh_history(self):
+        html_text = self.history_html
+        if self.is_busy():
+            if self.pending_response:
+                html_text += f"<br><b>AI:</b> {self.pending_response}"
+            else:
+                dots = "." * (1 + int(time.perf_counter() * 3) % 3)
+                html_text += f"<br><i>AI is thinking{dots}</i>"
+        self.chat_history.html_text = html_text
+        self.chat_history.rebuild()
+        self.history_dirty = False
+        self.last_refresh = time.perf_counter()
 
     def update(self, time_delta):
+        self.process_responses()
+        # Rebuilding the text box is expensive, so streamed tokens are batched
+        if self.is_busy() and (self.history_dirty or not self.pending_response):
+            if time.perf_counter() - self.last_refresh >= CHAT_REFRESH_INTERVAL:
+                self.refresh_history()
         self.manager.update(time_delta)
 
     def draw(self):
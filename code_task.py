@@ -138,6 +138,13 @@ class CodeTask:
             self.feedback_label.set_text("Great job! You've finished all the tasks.")
             self.is_solved = True
 
+    def reset(self):
+        # Start over from the first task, keeping the GUI manager and elements
+        self.current_task_index = 0
+        self.is_solved = False
+        self.feedback_label.set_text("")
+        self.hide()
+
     def show(self):
         self.is_active = True
         self.show_elements()
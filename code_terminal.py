@@ -1,5 +1,6 @@
 import pygame
 from settings import *
+from text_cache import text_cache
 
 class CodeTerminal(pygame.sprite.Sprite):
     def __init__(self, position, groups, avatar=None):
@@ -14,19 +15,17 @@ class CodeTerminal(pygame.sprite.Sprite):
         
         self.rect = self.image.get_rect(topleft=position)
         
-        # Create a font for the interaction prompt
-        self.font = pygame.font.Font(None, 24)
-        self.prompt_text = self.font.render("Press E to interact", True, (255, 255, 255))
+        self.prompt_text = text_cache.render("Press E to interact", 24, (255, 255, 255))
         self.prompt_rect = self.prompt_text.get_rect()
         
         self.code_solved = False
         self.level = None  # Add this line to initialize level
         self.update_prompt_text()  # Update prompt text based on initial code_solved status
 
-    def draw_prompt(self, surface, player):
+    def draw_prompt(self, surface, player, offset=(0, 0)):
         if self.rect.colliderect(player.rect.inflate(20, 20)):
             self.prompt_rect.midbottom = (self.rect.centerx, self.rect.top - 10)
-            surface.blit(self.prompt_text, self.prompt_rect)
+            return surface.blit(self.prompt_text, self.prompt_rect.move(offset))
 
     def interact(self, level):
         print("CodeTerminal: Interacting with code terminal")
@@ -40,9 +39,9 @@ class CodeTerminal(pygame.sprite.Sprite):
 
     def update_prompt_text(self):
         if self.code_solved:
-            self.prompt_text = self.font.render("Task already solved!", True, (255, 255, 255))
+            self.prompt_text = text_cache.render("Task already solved!", 24, (255, 255, 255))
         else:
-            self.prompt_text = self.font.render("Press E to interact", True, (255, 255, 255))
+            self.prompt_text = text_cache.render("Press E to interact", 24, (255, 255, 255))
 
     def update(self, time_delta):
         if self.level and self.level.code_task.is_solved and not self.code_solved:
@@ -50,5 +49,9 @@ class CodeTerminal(pygame.sprite.Sprite):
             self.update_prompt_text()
             print("CodeTerminal: Code task solved. code_solved set to True.")
 
+    def reset(self):
+        self.code_solved = False
+        self.update_prompt_text()
+
     def set_level(self, level):
         self.level = level  # Ensure level is set for access to code_task
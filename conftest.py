@@ -0,0 +1,17 @@
+import pygame
+import pytest
+
+# Small hand-built grids for the navigation and noise tests: 5 columns, 3 rows of 10px cells
+
+@pytest.fixture
+def cell_size():
+    return 10
+
+@pytest.fixture
+def world(cell_size):
+    return pygame.Rect(0, 0, 5 * cell_size, 3 * cell_size)
+
+@pytest.fixture
+def center(cell_size):
+    # Pixel position of the middle of a grid cell
+    return lambda column, row: (column * cell_size + cell_size // 2, row * cell_size + cell_size // 2)
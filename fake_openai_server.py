@@ -0,0 +1,108 @@
+"""Minimal OpenAI-compatible chat completions server for testing the chat terminal offline.
+
+    python fake_openai_server.py --port 8001 --token-delay 0.05
+    OPENAI_API_KEY=test OPENAI_BASE_URL=http://127.0.0.1:8001/v1 python main.py
+
+Replies echo the last user message word by word, streamed as server-sent
+events when the request asks for ``stream``. Summarization requests from the
+chat context get a short fixed summary.
+"""
+import argparse
+import json
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+class FakeChatHandler(BaseHTTPRequestHandler):
+    token_delay = 0.05
+    first_token_delay = 0.5
+
+    def do_POST(self):
+        if not self.path.rstrip('/').endswith('/chat/completions'):
+            self.send_error(404)
+            return
+        length = int(self.headers.get('Content-Length', 0))
+        request = json.loads(self.rfile.read(length) or b'{}')
+        messages = request.get('messages', [])
+        last_user = next((m['content'] for m in reversed(messages) if m.get('role') == 'user'), '')
+        reply = f"Station AI here. You said: {last_user}. Stay quiet and keep moving."
+        if messages and messages[0].get('role') == 'system' and messages[0]['content'].startswith('Summarize'):
+            reply = "The player has been asking the station AI for help."
+        model = request.get('model', 'fake-model')
+
+        if request.get('stream'):
+            self.stream_reply(reply, model)
+        else:
+            time.sleep(self.first_token_delay)
+            self.send_json({
+                'id': 'chatcmpl-fake',
+                'object': 'chat.completion',
+                'created': int(time.time()),
+                'model': model,
+                'choices': [{'index': 0, 'message': {'role': 'assistant', 'content': reply}, 'finish_reason': 'stop'}],
+                'usage': {'prompt_tokens': 0, 'completion_tokens': 0, 'total_tokens': 0},
+            })
+
+    def stream_reply(self, reply, model):
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+        time.sleep(self.first_token_delay)
+        words = reply.split(' ')
+        try:
+            for i, word in enumerate(words):
+                delta = {'content': word + (' ' if i < len(words) - 1 else '')}
+                if i == 0:
+                    delta['role'] = 'assistant'
+                self.send_event(self.chunk(model, delta, None))
+                time.sleep(self.token_delay)
+            self.send_event(self.chunk(model, {}, 'stop'))
+            self.wfile.write(b'data: [DONE]\n\n')
+            self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            # The client cancelled the request
+            pass
+
+    def chunk(self, model, delta, finish_reason):
+        return {
+            'id': 'chatcmpl-fake',
+            'object': 'chat.completion.chunk',
+            'created': int(time.time()),
+            'model': model,
+            'choices': [{'index': 0, 'delta': delta, 'finish_reason': finish_reason}],
+        }
+
+    def send_event(self, data):
+        self.wfile.write(f"data: {json.dumps(data)}\n\n".encode('utf-8'))
+        self.wfile.flush()
+
+    def send_json(self, data):
+        body = json.dumps(data).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake OpenAI-compatible chat server.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8001)
+    parser.add_argument('--token-delay', type=float, default=0.05, help="seconds between streamed words")
+    parser.add_argument('--first-token-delay', type=float, default=0.5)
+    args = parser.parse_args()
+
+    FakeChatHandler.token_delay = args.token_delay
+    FakeChatHandler.first_token_delay = args.first_token_delay
+    server = ThreadingHTTPServer((args.host, args.port), FakeChatHandler)
+    print(f"Fake OpenAI server listening on http://{args.host}:{args.port}/v1")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+import pygame
+
+class SystemClock:
+    """Wall-clock time since pygame.init(), used during normal play."""
+
+    def get_ticks(self):
+        return pygame.time.get_ticks()
+
+class FixedClock:
+    """Manually advanced clock for headless, fixed-timestep simulation."""
+
+    def __init__(self, start_ticks=0):
+        self.ticks = start_ticks
+
+    def get_ticks(self):
+        return self.ticks
+
+    def advance(self, milliseconds):
+        self.ticks += milliseconds
+
+clock = SystemClock()
+
+def get_ticks():
+    # Game logic reads time through here instead of pygame.time.get_ticks(),
+    # so the simulation can run on an injected clock
+    return clock.get_ticks()
+
+def set_clock(new_clock):
+    global clock
+    clock = new_clock
@@ -3,9 +3,24 @@ import pygame_gui
 from settings import *
 from story_generator import StoryGenerator
 from voice_generator import VoiceGenerator
+from response_cache import response_cache
 import os
+from concurrent.futures import ThreadPoolExecutor
 
 class Intro:
+    """Story cards shown before the first level.
+
+    The story and the voice lines are generated on worker threads: a placeholder
+    card is shown until the story arrives, and the voices of the next cards are
+    synthesized while the current one plays, so pressing Next never waits on the APIs.
+    """
+
+    default_cards = [
+        "You wake up in a strange, dark room...",
+        "The last thing you remember is boarding a space shuttle...",
+        "Now, you must survive and find a way to escape...",
+    ]
+
     def __init__(self, screen):
         self.screen = screen
         self.manager = pygame_gui.UIManager((WINDOW_WIDTH, WINDOW_HEIGHT))
@@ -13,16 +28,13 @@ class Intro:
         self.background = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
         self.background.fill(pygame.Color('#000000'))
 
+        self.executor = ThreadPoolExecutor(max_workers=1 + INTRO_VOICE_PREFETCH, thread_name_prefix='intro')
+        self.story_future = None
         if STORY_GENERATION:
-            story_generator = StoryGenerator()
-            full_story = story_generator.generate_story()
-            self.story_cards = full_story.split('\n\n')  # Split the story into paragraphs
+            self.story_cards = [INTRO_LOADING_TEXT]
+            self.story_future = self.executor.submit(self.generate_story)
         else:
-            self.story_cards = [
-                "You wake up in a strange, dark room...",
-                "The last thing you remember is boarding a space shuttle...",
-                "Now, you must survive and find a way to escape...",
-            ]
+            self.story_cards = list(self.default_cards)
         self.current_card = 0
 
         self.text_box = pygame_gui.elements.UITextBox(
@@ -39,6 +51,48 @@ class Intro:
 
         self.voice_generator = VoiceGenerator() if VOICE_GENERATION else None
         self.current_voice_file = None
+        self.voice_futures = {}  # card index -> future returning the voice file
+        self.pending_voice = None  # Card whose voice should start as soon as it is ready
+
+        if self.story_future:
+            self.next_button.disable()
+        else:
+            self.prefetch_voices()
+
+    def generate_story(self):
+        # Runs on a worker thread
+        full_story = StoryGenerator().generate_story()
+        return [card for card in full_story.split('\n\n') if card.strip()]  # Split the story into paragraphs
+
+    def check_story(self):
+        if not self.story_future or not self.story_future.done():
+            return
+        try:
+            self.story_cards = self.story_future.result() or list(self.default_cards)
+        except Exception as e:
+            print(f"Warning: Could not generate the story, using the default one: {e}")
+            self.story_cards = list(self.default_cards)
+        self.story_future = None
+        self.show_card()
+        self.next_button.enable()
+        self.prefetch_voices()
+
+    def show_card(self):
+        self.text_box.html_text = self.story_cards[self.current_card]
+        self.text_box.rebuild()
+
+    def prefetch_voices(self):
+        if not self.voice_generator:
+            return
+        # Card 0 is never voiced, Next starts the voice of the card it opens
+        last = min(self.current_card + INTRO_VOICE_PREFETCH, len(self.story_cards) - 1)
+        for index in range(max(self.current_card, 1), last + 1):
+            if index not in self.voice_futures:
+                self.voice_futures[index] = self.executor.submit(
+                    self.voice_generator.generate_voice,
+                    self.story_cards[index],
+                    f"voice_{index}.mp3"
+                )
 
     def handle_event(self, event):
         if event.type == pygame.USEREVENT:
@@ -46,11 +100,11 @@ class Intro:
                 if event.ui_element == self.next_button:
                     self.current_card += 1
                     if self.current_card < len(self.story_cards):
-                        self.text_box.html_text = self.story_cards[self.current_card]
-                        self.text_box.rebuild()
+                        self.show_card()
                         if self.voice_generator:
                             self.play_voice()
                     else:
+                        self.cleanup()
                         return 'intro_finished'
         
         self.manager.process_events(event)
@@ -59,16 +113,57 @@ class Intro:
     def play_voice(self):
         if self.current_voice_file:
             pygame.mixer.music.stop()
-            os.remove(self.current_voice_file)
-        
-        self.current_voice_file = self.voice_generator.generate_voice(
-            self.story_cards[self.current_card],
-            f"voice_{self.current_card}.mp3"
-        )
+            self.remove_voice_file(self.current_voice_file)
+            self.current_voice_file = None
+
+        self.prefetch_voices()
+        self.pending_voice = self.current_card
+        self.check_voice()
+
+    def check_voice(self):
+        future = self.voice_futures.get(self.pending_voice)
+        if future is None or not future.done():
+            return
+        del self.voice_futures[self.pending_voice]
+        self.pending_voice = None
+        try:
+            self.current_voice_file = future.result()
+        except Exception as e:
+            print(f"Warning: Could not generate voice: {e}")
+            return
         pygame.mixer.music.load(self.current_voice_file)
         pygame.mixer.music.play()
 
+    def remove_voice_file(self, path):
+        # Cached voices are kept for the next playthrough
+        if not response_cache.contains_path(path) and os.path.exists(path):
+            os.remove(path)
+
+    def cleanup(self):
+        # Safe to call more than once, main.py calls it again on quit
+        if self.current_voice_file:
+            pygame.mixer.music.stop()
+            self.remove_voice_file(self.current_voice_file)
+            self.current_voice_file = None
+        if self.story_future:
+            self.story_future.cancel()
+        # Voices that were prefetched but never played: unstarted ones are cancelled,
+        # the file of one still being generated is removed once it is written
+        for future in self.voice_futures.values():
+            if not future.cancel():
+                future.add_done_callback(self.remove_prefetched_voice)
+        self.voice_futures.clear()
+        self.pending_voice = None
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def remove_prefetched_voice(self, future):
+        if not future.exception():
+            self.remove_voice_file(future.result())
+
     def update(self, time_delta):
+        self.check_story()
+        if self.pending_voice is not None:
+            self.check_voice()
         self.manager.update(time_delta)
 
     def draw(self):
@@ -1,8 +1,9 @@
 import pygame
 import pygame_gui
 from settings import *
+import game_clock
 from player import Player
-from monster import Monster, RangedMonster, EnhancedMonster
+from spawn_director import SpawnDirector
 from ui import UI
 from save_terminal import SaveTerminal
 from npc import NPC
@@ -16,7 +17,17 @@ import random
 from communication_terminal import CommunicationTerminal
 from chat_terminal import ChatTerminal, ChatInterface
 from music_generator import MusicGenerator
-import json
+from asset_cache import asset_cache
+from renderer import DirtyRectRenderer
+from text_cache import text_cache
+from spatial_hash import SpatialHash
+from camera import Camera
+from navigation import NavGrid
+from noise import NoiseField
+from qte import QuickTimeEvent
+from tilemap import TileMap
+from level_loader import read_level_data
+from level_compiler import sprite_sizes
 
 class HidingSpot(pygame.sprite.Sprite):
     def __init__(self, position, size):
@@ -25,58 +36,84 @@ class HidingSpot(pygame.sprite.Sprite):
         self.image.fill((100, 100, 100))  # Gray color for hiding spots
         self.rect = self.image.get_rect(topleft=position)
 
+class Obstacle(pygame.sprite.Sprite):
+    def __init__(self, rect, groups):
+        super().__init__(groups)
+        self.rect = pygame.Rect(rect)
+
+class VisibleSpriteGroup(pygame.sprite.Group):
+    """Sprite group that skips sprites whose ``visible`` flag is off (e.g. the hidden player).
+
+    With a camera only the sprites inside the viewport are drawn, shifted to screen coordinates.
+    """
+
+    def draw(self, surface, camera=None):
+        if camera is None:
+            surface.blits([(sprite.image, sprite.rect) for sprite in self.sprites()
+                           if getattr(sprite, 'visible', True)], doreturn=False)
+            return
+        surface.blits([(sprite.image, camera.apply(sprite.rect)) for sprite in self.sprites()
+                       if getattr(sprite, 'visible', True) and camera.is_visible(sprite.rect)], doreturn=False)
+
 class TimerSprite(pygame.sprite.Sprite):
     def __init__(self, duration, position):
         super().__init__()
         self.duration = duration
-        self.start_time = pygame.time.get_ticks()
-        self.font = pygame.font.Font(None, 36)
+        self.start_time = game_clock.get_ticks()
+        self.font = text_cache.get_font(None, 36)
         self.position = position
         self.image = None
         self.rect = None
         self.update()  # Initialize image and rect
 
     def update(self):
-        remaining_time = self.duration - (pygame.time.get_ticks() - self.start_time) / 1000
+        remaining_time = self.duration - (game_clock.get_ticks() - self.start_time) / 1000
         if remaining_time > 0:
             time_text = f"{int(remaining_time)}"
-            self.image = self.font.render(time_text, True, (255, 0, 0))
+            self.image = text_cache.render(time_text, 36, (255, 0, 0))
             self.rect = self.image.get_rect(center=self.position)
         else:
             self.kill()
 
 class Level:
-    def __init__(self, level_file, terminal_avatar=None):
+    def __init__(self, level_file, terminal_avatar=None, level_data=None):
+        self.level_file = level_file
         self.terminal_avatar = terminal_avatar
         self.screen = pygame.display.get_surface()
-        self.visible_sprites = pygame.sprite.Group()
+        self.visible_sprites = VisibleSpriteGroup()
         self.obstacles = pygame.sprite.Group()
         self.monsters = pygame.sprite.Group()
         self.interactables = pygame.sprite.Group()
+        self.spatial_index = SpatialHash()
 
-        # Load level data
-        try:
-            with open(level_file, 'r') as f:
-                self.level_data = json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError) as e:
-            print(f"Error loading level file: {e}")
-            self.level_data = {}
+        # Load level data, unless the level loader already read it
+        self.level_data = level_data if level_data is not None else read_level_data(level_file)
+        self.transition = None  # Level file to switch to, picked up by the main loop
+
+        # Tiled levels stream their background in chunks instead of one full-screen image
+        self.tilemap = TileMap.from_level(self.level_data['tiles']) if self.level_data.get('tiles') else None
+
+        # Levels can be larger than the window, the camera follows the player
+        world = self.level_data.get('world', {})
+        default_width, default_height = WINDOW_WIDTH, WINDOW_HEIGHT
+        if self.tilemap:
+            default_width, default_height = max(WINDOW_WIDTH, self.tilemap.width), max(WINDOW_HEIGHT, self.tilemap.height)
+        self.world_rect = pygame.Rect(0, 0, world.get('width', default_width), world.get('height', default_height))
+        self.camera = Camera(self.world_rect)
 
-        self.background = self.load_background()
+        self.background = None if self.tilemap else self.load_background()
         player_pos = self.level_data.get('player_start', {'x': 640, 'y': 670})
         self.player = Player(position=(player_pos['x'], player_pos['y']), groups=[self.visible_sprites])
         self.player.level = self
+        self.camera.follow(self.player.rect)
         print(f"Player initialized at position: {player_pos}")
 
         self.vertical_zones = []
         self.create_level()
         self.ui = UI(self.player)
-        self.events = []
+        self.qte = QuickTimeEvent(self.finish_qte)  # Started by monsters checking the player's hiding spot
 
-        self.monster_spawn_time = pygame.time.get_ticks() + MONSTER_SPAWN_INTERVAL
-        self.monster_warning_time = self.monster_spawn_time - MONSTER_WARNING_DURATION
-        self.monster_despawn_time = None
-        self.monster = None
+        self.spawn_director = SpawnDirector(self)
 
         self.puzzle = Puzzle()
         self.code_tasks = [
@@ -95,10 +132,8 @@ class Level:
 
         self.load_background_music()
         self.timer_sprite_group = pygame.sprite.Group()
-        self.warning_timer_displayed = False
 
-        self.death_image = pygame.image.load('assets/images/death_text.png').convert_alpha()
-        self.death_image = pygame.transform.scale(self.death_image, (WINDOW_WIDTH, WINDOW_HEIGHT))
+        self.death_image = asset_cache.get_image('assets/images/death_text.png', size=(WINDOW_WIDTH, WINDOW_HEIGHT))
         self.is_game_over = False
 
         self.communication_terminal = CommunicationTerminal(self.screen)
@@ -107,17 +142,20 @@ class Level:
         self.show_chat_interface_flag = False
         self.chat_interface = None
 
+        self.renderer = DirtyRectRenderer(self.erase_background) if RENDER_MODE == 'dirty' else None
+
     def create_level(self):
+        # Sizes and index cells precomputed by level_compiler.py, if the level was compiled
+        compiled = self.level_data.get('compiled', {})
+        sizes = compiled.get('sizes') or sprite_sizes(self.player.rect.size)
+        cell_ranges = compiled.get('cell_ranges', {})
+
         # Add shelves (hiding spots)
         if 'shelves' in self.level_data and self.level_data['shelves']:
             for shelf_data in self.level_data['shelves']:
-                player_width = self.player.rect.width
-                player_height = self.player.rect.height
-                shelf_width = int(player_width * 1.5)
-                shelf_height = int(player_height * 1.2)
                 shelf = Shelve((shelf_data['x'], shelf_data['y']), 
                                [self.visible_sprites, self.interactables], 
-                               (shelf_width, shelf_height))
+                               sizes['shelf'])
 
         # Add the door
         if 'doors' in self.level_data:
@@ -144,6 +182,11 @@ class Level:
                 zone = pygame.Rect(zone_data['x'], zone_data['y'], zone_data['width'], zone_data['height'])
                 self.vertical_zones.append(zone)
 
+        # Add obstacles, they are part of the background image and only block movement
+        for obstacle_data in self.level_data.get('obstacles') or []:
+            Obstacle((obstacle_data['x'], obstacle_data['y'], obstacle_data['width'], obstacle_data['height']),
+                     [self.obstacles])
+
         # Add chat terminal
         if 'chat_terminal' in self.level_data and self.level_data['chat_terminal'] is not None:
             chat_terminal_pos = self.level_data['chat_terminal']
@@ -153,7 +196,21 @@ class Level:
                 self.screen  # Now self.screen is defined
             )
 
+        # Register static sprites in the spatial index
+        for interactable in self.interactables:
+            self.spatial_index.insert(interactable, 'interactables', cell_range=cell_ranges.get(tuple(interactable.rect)))
+        for obstacle in self.obstacles:
+            self.spatial_index.insert(obstacle, 'obstacles', cell_range=cell_ranges.get(tuple(obstacle.rect)))
+
+        # Monsters find their way around obstacles and through vertical zones on this grid
+        obstacle_rects = [obstacle.rect for obstacle in self.obstacles]
+        self.nav_grid = NavGrid(self.world_rect, obstacle_rects, self.vertical_zones)
+        self.noise_field = NoiseField(self.world_rect, obstacle_rects)  # What monsters can hear
+
     def handle_event(self, event):
+        # While the chat or code task is open, keys are typed into it, not into the quick time event
+        if not self.has_overlay() and self.qte.handle_event(event):
+            return
         if event.type == pygame.KEYDOWN:
             if event.key == pygame.K_ESCAPE:
                 if self.code_task.is_active:
@@ -182,54 +239,94 @@ class Level:
         if self.is_game_over:
             return
 
-        self.visible_sprites.update(time_delta)
-        self.monsters.update(time_delta)
+        # Monsters are in visible_sprites too, unless a MonsterBatch simulates them
+        batch = self.spawn_director.batch
+        self.update_sprites(self.visible_sprites, time_delta, skip=self.monsters if batch is not None else None)
+        if batch is not None:
+            batch.update(time_delta, self.player.rect, self.world_rect)
+        self.noise_field.update(time_delta)
+        self.nav_grid.track(self.player.rect.center)
+        self.spatial_index.sync()
         self.timer_sprite_group.update()
         self.player.level = self
 
+        self.camera.follow(self.player.rect)
+        if self.camera.moved and self.renderer:
+            self.renderer.invalidate()  # Everything shifted on screen
+        if self.tilemap:
+            self.tilemap.prefetch(self.camera.rect)
+
         if self.code_task.is_active:
             self.code_task.update(time_delta)
         if self.show_chat_interface_flag:
             self.chat_interface.update(time_delta)
 
         if not self.code_task.is_active and not self.show_chat_interface_flag:
+            # Monsters only decide (and start quick time events) while no overlay is open
+            self.qte.update(time_delta)
+            self.spawn_director.think_scheduler.update(game_clock.get_ticks())
+
             # Handle collisions and other game logic
-            collided_monsters = pygame.sprite.spritecollide(self.player, self.monsters, False)
-            for monster in collided_monsters:
-                self.player.take_damage(monster.damage)
+            # A hidden player can only be found through the hiding spot quick time event
+            if not self.player.is_hiding:
+                collided_monsters = self.spatial_index.query_collisions(self.player.rect, 'monsters')
+                for monster in collided_monsters:
+                    self.player.take_damage(monster.damage)
 
-            collided_obstacles = pygame.sprite.spritecollide(self.player, self.obstacles, False)
+            collided_obstacles = self.spatial_index.query_collisions(self.player.rect, 'obstacles')
             if collided_obstacles:
                 self.player.rect.x -= self.player.velocity.x
                 self.player.rect.y -= self.player.velocity.y
 
             # Monster spawning logic
-            current_time = pygame.time.get_ticks()
-            if len(self.monsters) == 0 and ENEMIES_ENABLED:
-                if current_time >= self.monster_spawn_time:
-                    self.spawn_monster()
-                elif current_time >= self.monster_warning_time and not self.warning_timer_displayed:
-                    warning_duration = (self.monster_spawn_time - current_time) / 1000
-                    timer_sprite = TimerSprite(warning_duration, (WINDOW_WIDTH // 2, 50))
-                    self.timer_sprite_group.add(timer_sprite)
-                    self.warning_timer_displayed = True
+            current_time = game_clock.get_ticks()
+            if ENEMIES_ENABLED:
+                warning_duration = self.spawn_director.take_warning(current_time)
+                if warning_duration:
+                    self.timer_sprite_group.add(TimerSprite(warning_duration, (WINDOW_WIDTH // 2, 50)))
+                self.spawn_director.update(current_time)
 
         if self.player.health <= 0:
             self.is_game_over = True
 
         if hasattr(self, 'door') and self.door.is_open and self.player.rect.colliderect(self.door.rect):
-            if self.level_data.get('next_level'):
+            if self.level_data.get('next_level') and self.transition is None:
                 self.load_next_level(self.level_data['next_level'])
 
-    def draw(self, screen):
-        screen.blit(self.background, (0, 0))
-        self.visible_sprites.draw(screen)
+    def update_sprites(self, group, time_delta, skip=None):
+        # Sprites near the viewport update every frame, the rest of the level
+        # catches up in larger steps every OFFSCREEN_UPDATE_INTERVAL seconds
+        active_rect = self.camera.rect.inflate(CAMERA_MARGIN * 2, CAMERA_MARGIN * 2)
+        sprites = group.sprites()
+        if skip is not None:
+            skipped = set(skip.sprites())
+            sprites = [sprite for sprite in sprites if sprite not in skipped]
+        for sprite in sprites:
+            elapsed = getattr(sprite, 'offscreen_time', 0) + time_delta
+            if sprite is self.player or active_rect.colliderect(sprite.rect) or elapsed >= OFFSCREEN_UPDATE_INTERVAL:
+                sprite.offscreen_time = 0
+                sprite.update(elapsed)
+            else:
+                sprite.offscreen_time = elapsed
 
-        for interactable in self.interactables:
+    def draw(self, screen):
+        # Returns the dirty rects to pass to pygame.display.update, or None when
+        # the whole screen was redrawn and needs a pygame.display.flip
+        if self.renderer and not self.has_overlay():
+            return self.draw_dirty(screen)
+        if self.renderer:
+            self.renderer.invalidate()
+
+        screen.fill((0, 0, 0))
+        self.draw_background(screen)
+        self.visible_sprites.draw(screen, self.camera)
+
+        for interactable in self.nearby_interactables():
             if hasattr(interactable, 'draw_prompt'):
-                interactable.draw_prompt(screen, self.player)
+                interactable.draw_prompt(screen, self.player, self.camera.offset)
 
         self.ui.draw(screen)
+        self.qte.draw(screen)
 
         if self.is_game_over:
             screen.blit(self.death_image, (0, 0))
@@ -239,6 +336,50 @@ class Level:
             self.chat_interface.draw()
         else:
             self.timer_sprite_group.draw(screen)
+        return None
+
+    def draw_dirty(self, screen):
+        self.renderer.begin(screen)
+
+        for sprite in self.visible_sprites:
+            if getattr(sprite, 'visible', True) and self.camera.is_visible(sprite.rect):
+                self.renderer.add(sprite, screen.blit(sprite.image, self.camera.apply(sprite.rect)), sprite.image)
+
+        for interactable in self.nearby_interactables():
+            if hasattr(interactable, 'draw_prompt'):
+                self.renderer.add(('prompt', interactable),
+                                  interactable.draw_prompt(screen, self.player, self.camera.offset))
+
+        for i, (rect, state) in enumerate(self.ui.draw(screen)):
+            self.renderer.add(('ui', i), rect, state)
+
+        self.renderer.add('qte', self.qte.draw(screen))
+
+        for sprite in self.timer_sprite_group:
+            self.renderer.add(sprite, screen.blit(sprite.image, sprite.rect), sprite.image)
+
+        return self.renderer.end()
+
+    def has_overlay(self):
+        # Full-screen overlays are drawn with a full redraw
+        return self.is_game_over or self.code_task.is_active or self.show_chat_interface_flag
+
+    def erase_background(self, surface, rect):
+        self.draw_background(surface, rect)
+
+    def draw_background(self, surface, area=None):
+        # The background image is repeated over the world, only the copies under
+        # the viewport (or under ``area``, in screen coordinates) are drawn
+        if self.tilemap:
+            self.tilemap.draw(surface, self.camera, area)
+            return
+        width, height = self.background.get_size()
+        view = self.camera.rect if area is None else self.camera.to_world(pygame.Rect(area))
+        for tile_y in range(view.top // height, (view.bottom - 1) // height + 1):
+            for tile_x in range(view.left // width, (view.right - 1) // width + 1):
+                tile_rect = pygame.Rect(tile_x * width, tile_y * height, width, height)
+                visible = tile_rect.clip(view)
+                surface.blit(self.background, self.camera.apply(visible), visible.move(-tile_rect.x, -tile_rect.y))
 
     def show_chat_interface(self):
         if not self.chat_interface:
@@ -246,6 +387,8 @@ class Level:
         self.show_chat_interface_flag = True
 
     def hide_chat_interface(self):
+        if self.chat_interface:
+            self.chat_interface.cancel_request()
         self.show_chat_interface_flag = False
 
     def load_background_music(self):
@@ -267,37 +410,48 @@ class Level:
             print(f"Error loading music: {e}")
             print("Continuing without background music.")
 
-    def spawn_monster(self):
-        if 'monsters' in self.level_data:
+    def spawn_monster(self, monster_data=None):
+        # monster_data ({'type', 'x', 'y'}) forces a specific monster, otherwise
+        # a random entry from the level's monsters is spawned
+        if monster_data is None and self.level_data.get('monsters'):
             monster_data = random.choice(self.level_data['monsters'])
-            if monster_data['type'] == 'Monster':
-                self.monster = Monster((monster_data['x'], monster_data['y']), 
-                                       [self.visible_sprites, self.monsters], 
-                                       self.player)
-            elif monster_data['type'] == 'RangedMonster':
-                self.monster = RangedMonster((monster_data['x'], monster_data['y']), 
-                                             [self.visible_sprites, self.monsters], 
-                                             self.player)
-            elif monster_data['type'] == 'EnhancedMonster':
-                self.monster = EnhancedMonster((monster_data['x'], monster_data['y']), 
-                                               [self.visible_sprites, self.monsters], 
-                                               self.player)
-            self.monster_spawn_time = pygame.time.get_ticks() + MONSTER_SPAWN_INTERVAL
-            self.monster_warning_time = self.monster_spawn_time - MONSTER_WARNING_DURATION
-            self.warning_timer_displayed = False
+        if monster_data:
+            return self.spawn_director.spawn(monster_data)
+        return None
+
+    def finish_qte(self, result, monster):
+        # Failing the quick time event gives the hidden player away to the monster checking the spot
+        if result != 'success' and self.player.is_hiding:
+            self.player.unhide()
+            if monster is not None and monster.alive():
+                monster.player_discovered()
 
     def restart_level(self):
-        self.cleanup()
-        self.__init__(self.level_data['current_level'], terminal_avatar=self.terminal_avatar)
+        # Put the level back into its loaded state in place: sprites, surfaces,
+        # GUI managers and the music are reused instead of being rebuilt
+        self.spawn_director.reset()  # Killed monsters go back to the pool
+        self.timer_sprite_group.empty()
+
+        self.player.reset()
+        self.noise_field.clear()
+        for interactable in self.interactables:
+            if hasattr(interactable, 'reset'):
+                interactable.reset()
+        self.code_task.reset()
+        self.hide_chat_interface()
+        self.show_communication_terminal = False
+        self.qte.reset()
+        self.transition = None
         self.is_game_over = False
+        if self.renderer:
+            self.renderer.invalidate()
 
     def load_background(self):
         background_file = self.level_data.get('background')
         if background_file:
             try:
                 background_path = os.path.join('assets', 'images', background_file)
-                background = pygame.image.load(background_path).convert()
-                background = pygame.transform.scale(background, (WINDOW_WIDTH, WINDOW_HEIGHT))
+                background = asset_cache.get_image(background_path, size=(WINDOW_WIDTH, WINDOW_HEIGHT), alpha=False)
                 print(f"Loaded background image: {background_path}")
                 return background
             except pygame.error as e:
@@ -313,20 +467,21 @@ class Level:
         return background
 
     def load_next_level(self, next_level_file):
+        # The main loop shows the loading screen and swaps in the new level
+        # once the level loader has it ready, see level_loader.py
         print(f"Loading next level: {next_level_file}")
-        # Clean up current level
-        self.cleanup()
-        # Reset attributes and load new level data
-        self.__init__(next_level_file, terminal_avatar=self.terminal_avatar)
-        self.is_game_over = False
-        print(f"Level: Loaded next level '{next_level_file}'.")
+        self.transition = next_level_file
 
     def cleanup(self):
         # Stop the music when the level is unloaded
         pygame.mixer.music.stop()
 
+    def nearby_interactables(self):
+        # Interactables close enough to show their prompt (prompts use a 20px margin)
+        return self.spatial_index.query(self.player.rect.inflate(20, 20), 'interactables')
+
     def check_interactables(self):
-        for interactable in self.interactables:
+        for interactable in self.spatial_index.query(self.player.rect, 'interactables'):
             if pygame.sprite.collide_rect(self.player, interactable):
                 print(f"Interacting with {type(interactable).__name__}")
                 if isinstance(interactable, Door):
@@ -0,0 +1,306 @@
+"""Level compiler: validates level files and writes pre-processed artifacts.
+
+Checks every key of a level against the schema below (unknown keys, wrong
+types and broken references are errors, keys the game does not use yet are
+warnings), resolves image and level references, and precomputes sprite sizes
+and spatial index cells. The result is pickled next to the other build
+outputs and picked up by the level loader while it is newer than its sources.
+
+    python level_compiler.py [assets/levels/*.json] [--check]
+"""
+import argparse
+import glob
+import hashlib
+import json
+import os
+import pickle
+import sys
+import pygame
+from settings import *
+from sprite_atlas import source_stamp
+
+COMPILER_VERSION = 1
+MONSTER_TYPES = ['Monster', 'RangedMonster', 'EnhancedMonster']
+PLAYER_IMAGE = 'assets/images/main_char.png'
+PLAYER_SCALE = 0.375  # Same scale as Player.load_frames
+PLACEHOLDER_PLAYER_SIZE = (32, 48)
+
+class LevelError(ValueError):
+    """A level file does not match the schema."""
+
+    def __init__(self, level_file, errors):
+        super().__init__(f"{level_file}: " + "; ".join(errors))
+        self.level_file = level_file
+        self.errors = errors
+
+def is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+def check_point(value, where, errors):
+    if not isinstance(value, dict) or not all(is_number(value.get(axis)) for axis in ('x', 'y')):
+        errors.append(f"{where} must be an object with numeric x and y")
+
+def check_rect(value, where, errors):
+    if not isinstance(value, dict) or not all(is_number(value.get(k)) for k in ('x', 'y', 'width', 'height')):
+        errors.append(f"{where} must be an object with numeric x, y, width and height")
+    elif value['width'] <= 0 or value['height'] <= 0:
+        errors.append(f"{where} must have a positive size")
+
+def check_size(value, where, errors):
+    if not isinstance(value, dict) or not all(is_number(value.get(k)) for k in ('width', 'height')):
+        errors.append(f"{where} must be an object with numeric width and height")
+    elif value['width'] < WINDOW_WIDTH or value['height'] < WINDOW_HEIGHT:
+        errors.append(f"{where} must be at least the window size {WINDOW_WIDTH}x{WINDOW_HEIGHT}")
+
+def check_tiles(value, where, errors):
+    if not isinstance(value, dict):
+        errors.append(f"{where} must be an object with tileset, tile_size and map")
+        return
+    check_string(value.get('tileset'), f"{where}.tileset", errors)
+    if not isinstance(value.get('tile_size'), int) or value['tile_size'] <= 0:
+        errors.append(f"{where}.tile_size must be a positive integer")
+    rows = value.get('map')
+    if not isinstance(rows, list) or not rows:
+        errors.append(f"{where}.map must be a non-empty list of rows")
+        return
+    for i, row in enumerate(rows):
+        if not isinstance(row, list) or not all(isinstance(tile, int) and tile >= -1 for tile in row):
+            errors.append(f"{where}.map[{i}] must be a list of tile indices (-1 for an empty cell)")
+
+def check_monster(value, where, errors):
+    check_point(value, where, errors)
+    if isinstance(value, dict) and value.get('type') not in MONSTER_TYPES:
+        errors.append(f"{where}.type must be one of {', '.join(MONSTER_TYPES)}, got {value.get('type')!r}")
+
+def check_wave_entry(value, where, errors):
+    check_monster(value, where, errors)
+    if isinstance(value, dict):
+        if not isinstance(value.get('count', 1), int) or value.get('count', 1) < 1:
+            errors.append(f"{where}.count must be a positive integer")
+        if not is_number(value.get('spacing', 0)):
+            errors.append(f"{where}.spacing must be a number")
+
+def check_wave(value, where, errors):
+    if not isinstance(value, dict):
+        errors.append(f"{where} must be an object with delay and monsters")
+        return
+    if not is_number(value.get('delay', 0)) or value.get('delay', 0) < 0:
+        errors.append(f"{where}.delay must be a non-negative number of milliseconds")
+    list_of(check_wave_entry)(value.get('monsters'), f"{where}.monsters", errors)
+
+def check_count(value, where, errors):
+    if not isinstance(value, int) or isinstance(value, bool) or value < 0:
+        errors.append(f"{where} must be a non-negative integer")
+
+def check_budget(value, where, errors):
+    if not isinstance(value, dict):
+        errors.append(f"{where} must map monster types to counts")
+        return
+    for monster_type, count in value.items():
+        if monster_type not in MONSTER_TYPES:
+            errors.append(f"{where} has unknown monster type {monster_type!r}")
+        check_count(count, f"{where}.{monster_type}", errors)
+
+def check_level_path(value, where, errors):
+    if not isinstance(value, str):
+        errors.append(f"{where} must be a level file path")
+    elif not os.path.exists(value):
+        errors.append(f"{where} refers to a missing level {value}")
+
+def check_string(value, where, errors):
+    if not isinstance(value, str):
+        errors.append(f"{where} must be a string")
+
+def check_bool(value, where, errors):
+    if not isinstance(value, bool):
+        errors.append(f"{where} must be true or false")
+
+def list_of(check):
+    def check_list(value, where, errors):
+        if not isinstance(value, list):
+            errors.append(f"{where} must be a list")
+            return
+        for i, item in enumerate(value):
+            check(item, f"{where}[{i}]", errors)
+    return check_list
+
+def optional(check):
+    def check_optional(value, where, errors):
+        if value is not None:
+            check(value, where, errors)
+    return check_optional
+
+# key -> (check, used by the game)
+SCHEMA = {
+    'current_level': (check_level_path, True),
+    'next_level': (optional(check_level_path), True),
+    'background': (check_string, True),
+    'tiles': (check_tiles, True),
+    'player_start': (check_point, True),
+    'world': (check_size, True),
+    'monsters': (list_of(check_monster), True),
+    'waves': (list_of(check_wave), True),
+    'max_monsters': (check_count, True),
+    'monster_budget': (check_budget, True),
+    'vertical_zones': (list_of(check_rect), True),
+    'code_terminal': (optional(check_point), True),
+    'chat_terminal': (optional(check_point), True),
+    'shelves': (list_of(check_point), True),
+    'doors': (list_of(check_point), True),
+    'hiding_spots': (list_of(check_rect), False),
+    'obstacles': (list_of(check_rect), True),
+    'npc': (optional(check_point), False),
+    'save_terminal': (optional(check_point), False),
+    'code_solved': (check_bool, False),
+}
+
+def validate(level_data, level_file):
+    """Return (errors, warnings) for a parsed level file."""
+    errors, warnings = [], []
+    if not isinstance(level_data, dict):
+        return ["the level must be a JSON object"], warnings
+    for key, value in level_data.items():
+        if key not in SCHEMA:
+            errors.append(f"unknown key '{key}'")
+            continue
+        check, used = SCHEMA[key]
+        check(value, key, errors)
+        if not used:
+            warnings.append(f"'{key}' is not used by the game yet")
+    for key in ('current_level', 'player_start'):
+        if key not in level_data:
+            errors.append(f"missing required key '{key}'")
+    if 'background' not in level_data and 'tiles' not in level_data:
+        errors.append("missing 'background' or 'tiles'")
+
+    if isinstance(level_data.get('current_level'), str) and \
+            os.path.normpath(level_data['current_level']) != os.path.normpath(level_file):
+        warnings.append(f"current_level is {level_data['current_level']}, restarting will load that file")
+    if isinstance(level_data.get('background'), str):
+        background_path = os.path.join('assets', 'images', level_data['background'])
+        if not os.path.exists(background_path):
+            warnings.append(f"background {background_path} not found, a placeholder will be drawn")
+    if isinstance(level_data.get('tiles'), dict) and isinstance(level_data['tiles'].get('tileset'), str):
+        tileset_path = os.path.join('assets', 'images', level_data['tiles']['tileset'])
+        if not os.path.exists(tileset_path):
+            warnings.append(f"tileset {tileset_path} not found, placeholder tiles will be drawn")
+    return errors, warnings
+
+def player_size():
+    try:
+        width, height = pygame.image.load(PLAYER_IMAGE).get_size()
+    except (pygame.error, FileNotFoundError):
+        width, height = PLACEHOLDER_PLAYER_SIZE
+    return (int(width * PLAYER_SCALE), int(height * PLAYER_SCALE))
+
+def sprite_sizes(player_size):
+    """Sizes of the sprites that scale with the player (see Level.create_level, Door and Monster)."""
+    width, height = player_size
+    return {
+        'player': (width, height),
+        'shelf': (int(width * 1.5), int(height * 1.2)),
+        'door': (int(width * 3), int(height * 4)),
+        'monster': (int(width * 1.5), int(height * 1.5)),
+    }
+
+def cell_range(rect, cell_size=SPATIAL_HASH_CELL_SIZE):
+    # Same bucketing as SpatialHash.cell_range
+    left, top, width, height = rect
+    return (left // cell_size, top // cell_size,
+            (left + width - 1) // cell_size, (top + height - 1) // cell_size)
+
+def static_rects(level_data, sizes):
+    rects = [(shelf['x'], shelf['y']) + sizes['shelf'] for shelf in level_data.get('shelves') or []]
+    rects += [(door['x'], door['y']) + sizes['door'] for door in level_data.get('doors') or []]
+    if level_data.get('chat_terminal'):
+        rects.append((level_data['chat_terminal']['x'], level_data['chat_terminal']['y'], 50, 50))
+    rects += [(o['x'], o['y'], o['width'], o['height']) for o in level_data.get('obstacles') or []]
+    return rects
+
+def compiled_path(level_file):
+    # The hash of the full path keeps levels with the same file name in different directories apart
+    name = os.path.splitext(os.path.basename(level_file))[0]
+    digest = hashlib.sha1(os.path.abspath(level_file).encode('utf-8')).hexdigest()[:12]
+    return os.path.join(COMPILED_LEVELS_DIR, f"{name}-{digest}.pickle")
+
+def dependencies(level_file):
+    return [level_file, PLAYER_IMAGE] if os.path.exists(PLAYER_IMAGE) else [level_file]
+
+def compile_level(level_file):
+    """Validate a level file and return (compiled level data, warnings). Raises LevelError."""
+    try:
+        with open(level_file, 'r') as f:
+            level_data = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        raise LevelError(level_file, [str(e)])
+    errors, warnings = validate(level_data, level_file)
+    if errors:
+        raise LevelError(level_file, errors)
+
+    sizes = sprite_sizes(player_size())
+    level_data['compiled'] = {
+        'sizes': sizes,
+        'cell_ranges': {rect: cell_range(rect) for rect in static_rects(level_data, sizes)},
+    }
+    return level_data, warnings
+
+def write_compiled(level_file, level_data):
+    path = compiled_path(level_file)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    artifact = {
+        'version': COMPILER_VERSION,
+        'cell_size': SPATIAL_HASH_CELL_SIZE,
+        'sources': {source: source_stamp(source) for source in dependencies(level_file)},
+        'level_data': level_data,
+    }
+    with open(path, 'wb') as f:
+        pickle.dump(artifact, f, protocol=pickle.HIGHEST_PROTOCOL)
+    return path
+
+def load_compiled(level_file):
+    """Return the compiled level data, or None when it is missing or older than its sources."""
+    path = compiled_path(level_file)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'rb') as f:
+            artifact = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError) as e:
+        print(f"Warning: Could not read compiled level {path}: {e}")
+        return None
+    if artifact.get('version') != COMPILER_VERSION or artifact.get('cell_size') != SPATIAL_HASH_CELL_SIZE:
+        return None
+    sources = artifact.get('sources', {})
+    if set(sources) != set(dependencies(level_file)):
+        return None
+    for source, stamp in sources.items():
+        if not os.path.exists(source) or source_stamp(source) != stamp:
+            return None
+    return artifact['level_data']
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate and compile level files.")
+    parser.add_argument('levels', nargs='*', default=sorted(glob.glob('assets/levels/*.json')))
+    parser.add_argument('--check', action='store_true', help="only validate, do not write artifacts")
+    args = parser.parse_args()
+
+    failed = 0
+    for level_file in args.levels:
+        try:
+            level_data, warnings = compile_level(level_file)
+        except LevelError as e:
+            failed += 1
+            print(f"{level_file}: FAILED")
+            for error in e.errors:
+                print(f"  error: {error}")
+            continue
+        status = "ok" if args.check else f"-> {write_compiled(level_file, level_data)}"
+        print(f"{level_file}: {status}")
+        for warning in warnings:
+            print(f"  warning: {warning}")
+
+    print(f"{len(args.levels) - failed}/{len(args.levels)} levels valid")
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
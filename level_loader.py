@@ -0,0 +1,85 @@
+import pygame
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from settings import *
+from asset_cache import asset_cache
+from level_compiler import load_compiled
+
+# Images used by every level, the rest depends on what the level file contains
+COMMON_IMAGES = [
+    'assets/images/main_char.png',
+    'assets/images/main_char_move.png',
+    'assets/images/death.png',
+    'assets/images/death_text.png',
+]
+
+def read_level_data(level_file):
+    if USE_COMPILED_LEVELS:
+        level_data = load_compiled(level_file)
+        if level_data is not None:
+            return level_data
+    try:
+        with open(level_file, 'r') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError) as e:
+        print(f"Error loading level file: {e}")
+        return {}
+
+def level_images(level_data):
+    images = list(COMMON_IMAGES)
+    if level_data.get('background'):
+        images.append(os.path.join('assets', 'images', level_data['background']))
+    if level_data.get('tiles'):
+        images.append(os.path.join('assets', 'images', level_data['tiles']['tileset']))
+    if level_data.get('doors'):
+        images.append('assets/images/door.png')
+    if level_data.get('shelves'):
+        images.append('assets/images/hide.png')
+    if level_data.get('chat_terminal'):
+        images.append(CHAT_TERMINAL_IMAGE)
+    if level_data.get('monsters') or level_data.get('waves'):
+        images += ['assets/images/enemy.png', 'assets/images/enemy_attack.png']
+    return images
+
+class LevelLoader:
+    """Reads level files and decodes their images on a worker thread.
+
+    ``preload`` starts loading a level in the background, ``is_ready`` tells
+    when it is done and ``create_level`` builds the Level on the main thread
+    from the prepared data. Every created level gets its next level preloaded.
+    """
+
+    def __init__(self):
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='level-loader')
+        self.futures = {}  # level file -> future returning the level data
+
+    def prepare(self, level_file):
+        # Runs on the worker thread
+        level_data = read_level_data(level_file)
+        for path in level_images(level_data):
+            try:
+                asset_cache.preload(path)
+            except (pygame.error, FileNotFoundError) as e:
+                print(f"Warning: Could not preload {path}: {e}")
+        return level_data
+
+    def preload(self, level_file):
+        if level_file and level_file not in self.futures:
+            self.futures[level_file] = self.executor.submit(self.prepare, level_file)
+
+    def is_ready(self, level_file):
+        self.preload(level_file)
+        return self.futures[level_file].done()
+
+    def create_level(self, level_file, **kwargs):
+        from level import Level
+
+        self.preload(level_file)
+        level_data = self.futures.pop(level_file).result()
+        level = Level(level_file, level_data=level_data, **kwargs)
+        asset_cache.drop_preloaded()
+        self.preload(level.level_data.get('next_level'))
+        return level
+
+level_loader = LevelLoader()
@@ -7,12 +7,23 @@ from intro import Intro
 import sys
 import traceback  # Add this import
 from player import Player
+from asset_cache import asset_cache
+from text_cache import text_cache
+from level_loader import level_loader
+
+def draw_loading_screen(screen):
+    screen.fill((0, 0, 0))
+    loading_text = text_cache.render("Loading...", 36, (255, 255, 255))
+    screen.blit(loading_text, loading_text.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2)))
 
 def main():
     try:
         pygame.init()
         screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
         pygame.display.set_caption("Space Survival Horror")
+        if USE_SPRITE_ATLAS:
+            asset_cache.load_atlas(SPRITE_ATLAS_PATH)
+        level_loader.preload(START_LEVEL)  # Decoded while the menu and intro are shown
         clock = pygame.time.Clock()
         
         main_menu = MainMenu(screen)
@@ -28,11 +39,13 @@ def main():
             terminal_avatar.fill((0, 255, 0))  # Green placeholder
         
         level = None
+        pending_level = None  # Level file being loaded behind the loading screen
         intro = Intro(screen)
 
         running = True
         while running:
             time_delta = clock.tick(FPS) / 1000.0
+            dirty_rects = None
 
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
@@ -44,8 +57,8 @@ def main():
                         if SHOW_INTRO:
                             current_screen = 'intro'
                         else:
-                            current_screen = 'game'
-                            level = Level('assets/levels/level1.json', terminal_avatar=terminal_avatar)
+                            current_screen = 'loading'
+                            pending_level = START_LEVEL
                     elif action == 'show_settings':
                         current_screen = 'settings'
                     elif action == 'quit':
@@ -57,8 +70,8 @@ def main():
                 elif current_screen == 'intro':
                     action = intro.handle_event(event)
                     if action == 'intro_finished':
-                        current_screen = 'game'
-                        level = Level('assets/levels/level1.json', terminal_avatar=terminal_avatar)
+                        current_screen = 'loading'
+                        pending_level = START_LEVEL
                 elif current_screen == 'game':
                     if event.type == pygame.KEYDOWN:
                         if event.key == pygame.K_ESCAPE:
@@ -81,19 +94,32 @@ def main():
                 intro.draw()
             elif current_screen == 'game':
                 level.update(time_delta)
-                screen.fill((0, 0, 0))
-                level.draw(screen)
+                dirty_rects = level.draw(screen)
+                if level.transition:
+                    level.cleanup()
+                    current_screen = 'loading'
+                    pending_level = level.transition
+            elif current_screen == 'loading':
+                draw_loading_screen(screen)
+                if level_loader.is_ready(pending_level):
+                    # Swap in the fully built level in one step
+                    level = level_loader.create_level(pending_level, terminal_avatar=terminal_avatar)
+                    pending_level = None
+                    current_screen = 'game'
 
             # Add respawn prompt if game is over
             if level and level.is_game_over:
-                font = pygame.font.Font(None, 36)
-                respawn_text = font.render("Press E to respawn", True, (255, 255, 255))
+                respawn_text = text_cache.render("Press E to respawn", 36, (255, 255, 255))
                 screen.blit(respawn_text, (WINDOW_WIDTH // 2 - respawn_text.get_width() // 2, WINDOW_HEIGHT - 50))
 
-            pygame.display.flip()
+            if dirty_rects is None:
+                pygame.display.flip()
+            else:
+                pygame.display.update(dirty_rects)
 
         if level:
             level.cleanup()
+        intro.cleanup()
     except pygame.error as e:
         print(f"Pygame error: {e}")
         traceback.print_exc()  # Add this line
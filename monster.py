@@ -1,45 +1,48 @@
 import pygame
 from settings import *
+import game_clock
 import math
 import random
+from asset_cache import asset_cache
+from monster_ai import MONSTER_BEHAVIOR
 
 class Monster(pygame.sprite.Sprite):
+    tint = None  # Color multiplied into the shared sprite frames, None keeps the original colors
+    frame_tables = {}  # (monster class, frame size) -> frame table, built on the first spawn
+    speed_factor = 1.0  # Multipliers of the base monster settings
+    detect_factor = 1.0
+    base_damage = 1
+    behavior = MONSTER_BEHAVIOR  # AI states, see monster_ai.py
+    preferred_distance = 0  # Chasing monsters back off when the player is closer than this
+
     def __init__(self, position, groups, player):
         super().__init__(groups)
+        self.pool = None  # Spawn director that takes the monster back when it is killed
+        self.batch = None  # MonsterBatch that moves the monster, if any
+        self.batch_slot = None
+        self.think_token = None  # Set while a ThinkScheduler runs the monster's AI
         
-        try:
-            # Load sprite sheets
-            self.movement_spritesheet = pygame.image.load('assets/images/enemy.png').convert_alpha()
-            self.attack_spritesheet = pygame.image.load('assets/images/enemy_attack.png').convert_alpha()
-        except pygame.error as e:
-            print(f"Error loading monster images: {e}")
-            # Create placeholder images
-            self.movement_spritesheet = pygame.Surface((96, 32))
-            self.movement_spritesheet.fill((255, 0, 0))  # Red placeholder
-            self.attack_spritesheet = pygame.Surface((160, 32))
-            self.attack_spritesheet.fill((255, 255, 0))  # Yellow placeholder
-        
-        # Set up animation frames
-        self.movement_frames = self.get_frames(self.movement_spritesheet, 3)
-        self.attack_frames = self.get_frames(self.attack_spritesheet, 5)
-        
-        # Scale frames to be 1.5 times bigger than the player
-        player_width = player.rect.width
-        player_height = player.rect.height
-        monster_width = int(player_width * 1.5)
-        monster_height = int(player_height * 1.5)
-        
-        self.movement_frames = [pygame.transform.scale(frame, (monster_width, monster_height)) for frame in self.movement_frames]
-        self.attack_frames = [pygame.transform.scale(frame, (monster_width, monster_height)) for frame in self.attack_frames]
-        
+        # Indexed as frame_table[facing_right][animation][frame], shared by every monster of this type
+        self.frame_table = self.load_frame_table(self.frame_size(player))
+        self.movement_frames = self.frame_table[False]['movement']
+        self.attack_frames = self.frame_table[False]['attack']
+
         self.image = self.movement_frames[0]
         self.rect = self.image.get_rect(topleft=position)
-
-        self.speed = MONSTER_SPEED
-        self.detect_radius = MONSTER_DETECTION_RADIUS
         self.player = player
-        self.damage = 1
-        self.state = 'patrol'
+        self.reset(position)
+
+    def reset(self, position):
+        # Fresh state for a new spawn; pooled monsters are reused through this
+        self.image = self.movement_frames[0]
+        self.rect.topleft = position
+
+        self.x = float(position[0])  # Sub-pixel position, rect.x only holds whole pixels
+
+        self.base_speed = MONSTER_SPEED * self.speed_factor
+        self.speed = self.base_speed
+        self.detect_radius = MONSTER_DETECTION_RADIUS * self.detect_factor
+        self.damage = self.base_damage
 
         self.gravity = 0.8
         self.velocity = pygame.math.Vector2(0, 0)
@@ -56,43 +59,100 @@ class Monster(pygame.sprite.Sprite):
         self.attack_duration = 1000  # 1 second for full attack animation
 
         self.direction = random.choice([-1, 1])  # Start with a random direction
-        self.direction_change_time = pygame.time.get_ticks() + random.randint(3000, 5000)  # Change direction every 3-5 seconds
-        self.spawn_time = pygame.time.get_ticks()
+        self.direction_change_time = game_clock.get_ticks() + random.randint(3000, 5000)  # Change direction every 3-5 seconds
+        self.spawn_time = game_clock.get_ticks()
         self.initial_y = self.rect.y
         self.y_offset = 20  # Adjust this value to move the monster lower
+        self.y = float(self.initial_y + self.y_offset)
+        self.rect.y = int(self.y)
+        self.heading = (self.direction, 0)  # Movement along x and y, each -1, 0 or 1
+        self.offscreen_time = 0  # Time not yet simulated while far from the camera, see Level.update_sprites
+
+        # AI, updated by think()
+        self.state = 'patrol'
+        self.state_time = self.spawn_time
+        self.target = None  # Point investigate, search and check_hiding_spot head to
+        self.player_distance = math.inf
+        self.player_visible = False
+        self.player_heard = False
+        self.last_seen_time = None
+        self.last_known_position = None
+
+    def kill(self):
+        was_alive = self.alive()
+        super().kill()
+        if was_alive and self.pool is not None:
+            self.pool.release(self)
 
-    def get_frames(self, spritesheet, num_frames):
+    @staticmethod
+    def frame_size(player):
+        # Frames are 1.5 times bigger than the player
+        return (int(player.rect.width * 1.5), int(player.rect.height * 1.5))
+
+    @classmethod
+    def load_frame_table(cls, size):
+        table = Monster.frame_tables.get((cls, size))
+        if table is not None:
+            return table
+
+        try:
+            # The sprite sheets face left, so facing right uses the mirrored frames
+            table = {
+                facing_right: {
+                    'movement': asset_cache.get_frames('assets/images/enemy.png', 3,
+                                                       size=size, flip=facing_right, tint=cls.tint),
+                    'attack': asset_cache.get_frames('assets/images/enemy_attack.png', 5,
+                                                     size=size, flip=facing_right, tint=cls.tint),
+                }
+                for facing_right in (False, True)
+            }
+        except pygame.error as e:
+            print(f"Error loading monster images: {e}")
+            # Create placeholder images
+            movement_spritesheet = pygame.Surface((96, 32))
+            movement_spritesheet.fill((255, 0, 0))  # Red placeholder
+            attack_spritesheet = pygame.Surface((160, 32))
+            attack_spritesheet.fill((255, 255, 0))  # Yellow placeholder
+            table = {
+                facing_right: {
+                    'movement': [asset_cache.transform(frame, size, flip=facing_right, tint=cls.tint)
+                                 for frame in cls.get_frames(movement_spritesheet, 3)],
+                    'attack': [asset_cache.transform(frame, size, flip=facing_right, tint=cls.tint)
+                               for frame in cls.get_frames(attack_spritesheet, 5)],
+                }
+                for facing_right in (False, True)
+            }
+        Monster.frame_tables[(cls, size)] = table
+        return table
+
+    @staticmethod
+    def get_frames(spritesheet, num_frames):
         frame_width = spritesheet.get_width() // num_frames
         frame_height = spritesheet.get_height()
         return [spritesheet.subsurface((i * frame_width, 0, frame_width, frame_height)) for i in range(num_frames)]
 
     def update(self, time_delta):
-        current_time = pygame.time.get_ticks()
+        # Decisions are made in think(), here the monster only moves and animates
+        step = self.speed * time_delta * FPS
+        self.x += step * self.heading[0]
+        self.y += step * self.heading[1]
 
-        # Change direction periodically
-        if current_time > self.direction_change_time:
-            self.direction *= -1  # Reverse direction
-            self.direction_change_time = current_time + random.randint(3000, 5000)
-
-        # Move in the current direction
-        self.rect.x += self.speed * self.direction * time_delta  # Use time_delta for smooth movement
-        self.rect.y = self.initial_y + self.y_offset  # Keep the monster slightly lower
-
-        # Keep the monster within the screen bounds
-        if self.rect.left < 0:
-            self.rect.left = 0
+        # Keep the monster within the level bounds
+        world_rect = self.player.level.world_rect
+        if self.x < world_rect.left:
+            self.x = world_rect.left
             self.direction = 1
-        elif self.rect.right > WINDOW_WIDTH:
-            self.rect.right = WINDOW_WIDTH
+            self.heading = (1, self.heading[1])
+        elif self.x + self.rect.width > world_rect.right:
+            self.x = world_rect.right - self.rect.width
             self.direction = -1
+            self.heading = (-1, self.heading[1])
+        self.y = min(max(self.y, world_rect.top), world_rect.bottom - self.rect.height)
+        self.rect.topleft = (int(self.x), int(self.y))
 
         # Update animation
         self.animate(time_delta)  # Pass time_delta to animate method
 
-        # Despawn after 10 seconds
-        if current_time - self.spawn_time > 10000:  # 10 seconds
-            self.kill()
-
     def animate(self, time_delta):
         self.animation_time += time_delta * 1000  # Convert to milliseconds
         
@@ -101,22 +161,21 @@ class Monster(pygame.sprite.Sprite):
             
             if self.is_attacking:
                 self.current_frame = (self.current_frame + 1) % len(self.attack_frames)
-                self.image = self.attack_frames[self.current_frame]
-                
                 if self.current_frame == 0:
                     self.is_attacking = False
             else:
                 self.current_frame = (self.current_frame + 1) % len(self.movement_frames)
-                self.image = self.movement_frames[self.current_frame]
 
-        # Flip the image based on direction
-        if self.direction > 0:
-            self.image = pygame.transform.flip(self.image, True, False)
+        # Pick the pre-flipped frame for the current direction
+        animation = 'attack' if self.is_attacking else 'movement'
+        self.image = self.frame_table[self.direction > 0][animation][self.current_frame]
 
     def start_attack(self):
         self.is_attacking = True
         self.current_frame = 0
         self.attack_cooldown = self.attack_duration
+        if self.batch is not None:
+            self.batch.start_attack(self.batch_slot)
 
     def is_in_vertical_zone(self):
         # Check if the monster is within any vertical movement zone
@@ -126,56 +185,174 @@ class Monster(pygame.sprite.Sprite):
                     return True
         return False
 
+    def think(self, current_time):
+        """Perceive the player, follow the state transitions and pick a direction.
+
+        Called by a ThinkScheduler a few times a second rather than every frame.
+        """
+        if self.state == 'patrol' and current_time - self.spawn_time > MONSTER_LIFETIME:
+            self.kill()
+            return
+        self.perceive(current_time)
+
+        state = self.behavior[self.state]
+        next_state = None
+        if state.get('duration') and current_time - self.state_time > state['duration']:
+            next_state = state['timeout']
+        else:
+            for condition, target_state in state['transitions']:
+                if getattr(self, condition)(current_time):
+                    next_state = target_state
+                    break
+        if next_state:
+            self.enter_state(next_state, current_time)
+        getattr(self, self.behavior[self.state]['steer'])(current_time)
+
+    def perceive(self, current_time):
+        player = self.player
+        if self.batch is not None:
+            self.player_distance = self.batch.player_distance[self.batch_slot]
+        else:
+            self.player_distance = math.hypot(player.rect.centerx - self.rect.centerx,
+                                              player.rect.centery - self.rect.centery)
+        self.player_visible = self.can_see_player()
+        # Hearing reads the one noise grid cell the monster stands in
+        noise_field = player.level.noise_field
+        self.player_heard = noise_field.level_at(self.rect.center) * self.detect_factor >= MONSTER_NOISE_THRESHOLD
+        if self.player_visible:
+            self.last_seen_time = current_time
+            self.last_known_position = player.rect.center
+        elif self.player_heard:
+            self.last_known_position = noise_field.source_at(self.rect.center)
+
+    def enter_state(self, state, current_time):
+        self.state = state
+        self.state_time = current_time
+        self.checking_hiding_spot = False
+        if state == 'check_hiding_spot' and self.player.hiding_spot is not None:
+            self.target = self.player.hiding_spot.rect.center
+        elif state in ('investigate', 'search'):
+            self.target = self.last_known_position or self.rect.center
+        else:
+            self.target = None
+
+    def steer(self, direction, speed_factor=None, heading=None):
+        if speed_factor is None:
+            speed_factor = self.behavior[self.state]['speed']
+        self.direction = direction
+        self.heading = heading or (direction, 0)
+        self.speed = self.base_speed * speed_factor
+        if self.batch is not None:
+            self.batch.steer(self.batch_slot, direction, self.speed, self.heading)
+
+    def steer_towards(self, point, speed_factor=None):
+        # Follow the level's shared flow field, or head straight for the point
+        # when it is in the same cell or cannot be reached
+        facing = 1 if point[0] > self.rect.centerx else -1
+        heading = self.player.level.nav_grid.step(self.rect.center, point) or (facing, 0)
+        self.steer(heading[0] or facing, speed_factor, heading)
+
+    def blocked_ahead(self, direction):
+        ahead = (self.rect.centerx + direction * NAV_CELL_SIZE, self.rect.centery)
+        return not self.player.level.nav_grid.is_open(ahead)
+
+    # Conditions, see MONSTER_BEHAVIOR
+    def sees_player(self, current_time):
+        return self.player_visible
+
+    def hears_player(self, current_time):
+        return self.player_heard
+
+    def reached_target(self, current_time):
+        return self.target is None or math.hypot(self.rect.centerx - self.target[0],
+                                                 self.rect.centery - self.target[1]) <= MONSTER_ATTACK_DISTANCE
+
+    def player_hid_nearby(self, current_time):
+        return self.player.is_hiding and self.player_distance <= self.detect_radius
+
+    def passes_hiding_spot(self, current_time):
+        spot = self.player.hiding_spot
+        if not self.player.is_hiding or spot is None:
+            return False
+        distance = math.hypot(spot.rect.centerx - self.rect.centerx, spot.rect.centery - self.rect.centery)
+        # Thinks run at a fixed rate, so the chance per second does not depend on the frame rate
+        return distance <= self.check_hiding_spot_radius and random.random() < MONSTER_HIDING_CHECK_CHANCE
+
+    def lost_player(self, current_time):
+        return self.last_seen_time is None or current_time - self.last_seen_time > MONSTER_LOSE_SIGHT_TIME
+
+    # Steering, see MONSTER_BEHAVIOR
+    def steer_wander(self, current_time):
+        # Change direction every 3-5 seconds
+        direction = self.direction
+        if current_time > self.direction_change_time or self.blocked_ahead(direction):
+            direction = -direction
+            self.direction_change_time = current_time + random.randint(3000, 5000)
+        self.steer(direction)
+
+    def steer_to_target(self, current_time):
+        if self.reached_target(current_time):
+            self.steer(self.direction, 0)  # Stand and look around
+            if self.state == 'check_hiding_spot' and not self.checking_hiding_spot:
+                self.checking_hiding_spot = True
+                self.check_hiding_spot()
+        else:
+            self.steer_towards(self.target)
+
+    def steer_pursue(self, current_time):
+        offset = self.player.rect.centerx - self.rect.centerx
+        direction = 1 if offset > 0 else -1
+        if self.player_distance < self.preferred_distance:
+            self.steer(-direction)  # Back off, ranged monsters keep their distance
+        elif abs(offset) <= MONSTER_ATTACK_DISTANCE // 2 and self.player_distance <= MONSTER_ATTACK_DISTANCE:
+            self.steer(direction, 0)
+        else:
+            self.steer_towards(self.player.rect.center)
+        if self.player_distance <= MONSTER_ATTACK_DISTANCE and not self.is_attacking:
+            self.start_attack()
+
+    def steer_search(self, current_time):
+        # Pace back and forth around the last known position of the player
+        if abs(self.rect.centerx - self.target[0]) > self.detect_radius / 2:
+            self.steer_towards(self.target)
+            return
+        direction = self.direction
+        if current_time > self.direction_change_time or self.blocked_ahead(direction):
+            direction = -direction
+            self.direction_change_time = current_time + random.randint(1000, 2000)
+        self.steer(direction)
+
+    def check_hiding_spot(self):
+        # The player hiding here has to win a quick time event to stay hidden
+        spot = self.player.hiding_spot
+        if self.player.is_hiding and spot is not None and spot.rect.collidepoint(self.target):
+            self.player.level.qte.start(self)
+
     def player_discovered(self):
-        self.state = 'chase'
-        self.speed *= 1.5  # Increase speed when player is discovered
+        self.last_seen_time = game_clock.get_ticks()
+        self.last_known_position = self.player.rect.center
+        self.enter_state('chase', self.last_seen_time)
 
     def can_see_player(self):
-        # Implement line-of-sight check here
-        # For simplicity, we'll just check if the player is not hiding
-        return not self.player.is_hiding
+        # No walls block the view yet: the player is seen when not hiding, within
+        # the detection radius and in front of the monster (or very close behind)
+        if self.player.is_hiding or self.player_distance > self.detect_radius:
+            return False
+        offset = self.player.rect.centerx - self.rect.centerx
+        return offset * self.direction >= 0 or self.player_distance <= self.detect_radius / 3
 
 class RangedMonster(Monster):
-    def __init__(self, position, groups, player):
-        super().__init__(position, groups, player)
-        # Load ranged monster specific sprite sheets here if available
-        # For now, we'll just tint the existing sprites green
-        self.movement_frames = [self.tint_surface(frame, (0, 255, 0)) for frame in self.movement_frames]
-        self.attack_frames = [self.tint_surface(frame, (0, 255, 0)) for frame in self.attack_frames]
-        self.image = self.movement_frames[0]
-        self.speed = MONSTER_SPEED * 1.2
-        self.attack_range = 200
-
-    def tint_surface(self, surface, tint_color):
-        tinted_surface = surface.copy()
-        tinted_surface.fill(tint_color, special_flags=pygame.BLEND_RGB_MULT)
-        return tinted_surface
-
-    def update(self, time_delta):
-        super().update(time_delta)
-        distance = pygame.math.Vector2(self.player.rect.center) - pygame.math.Vector2(self.rect.center)
-        if self.attack_range > distance.length() > 100:
-            # Attack logic here (e.g., spawn a projectile)
-            pass
-        elif distance.length() <= 100:
-            # Move away from player
-            if distance.length() != 0:
-                direction = distance.normalize()
-                self.velocity.x = -direction.x * self.speed * time_delta  # Use time_delta for smooth movement
+    # Load ranged monster specific sprite sheets here if available
+    # For now, we'll just tint the existing sprites green
+    tint = (0, 255, 0)
+    speed_factor = 1.2
+    attack_range = 200
+    preferred_distance = 100
 
 class EnhancedMonster(Monster):
-    def __init__(self, position, groups, player):
-        super().__init__(position, groups, player)
-        # Load enhanced monster specific sprite sheets here if available
-        # For now, we'll just tint the existing sprites blue
-        self.movement_frames = [self.tint_surface(frame, (0, 0, 255)) for frame in self.movement_frames]
-        self.attack_frames = [self.tint_surface(frame, (0, 0, 255)) for frame in self.attack_frames]
-        self.image = self.movement_frames[0]
-        self.speed = MONSTER_SPEED * 0.8
-        self.damage = 2
-        self.detect_radius = MONSTER_DETECTION_RADIUS * 1.5
-
-    def tint_surface(self, surface, tint_color):
-        tinted_surface = surface.copy()
-        tinted_surface.fill(tint_color, special_flags=pygame.BLEND_RGB_MULT)
-        return tinted_surface
+    # Load enhanced monster specific sprite sheets here if available
+    # For now, we'll just tint the existing sprites blue
+    tint = (0, 0, 255)
+    speed_factor = 0.8
+    detect_factor = 1.5
+    base_damage = 2
@@ -0,0 +1,88 @@
+import heapq
+import itertools
+import random
+from settings import *
+
+# Monster behaviour as data. For each state:
+#   speed       multiplier of the monster's base speed
+#   steer       Monster method that picks the direction on every think
+#   duration    ms the state may last, then the monster switches to ``timeout``
+#   transitions (condition, next state) pairs checked in order on every think,
+#               conditions are Monster methods reading the last perception
+MONSTER_BEHAVIOR = {
+    'patrol': {
+        'speed': 1.0,
+        'steer': 'steer_wander',
+        'transitions': [('sees_player', 'chase'), ('hears_player', 'investigate'),
+                        ('passes_hiding_spot', 'check_hiding_spot')],
+    },
+    'investigate': {
+        'speed': 1.2,
+        'steer': 'steer_to_target',
+        'duration': 6000,
+        'timeout': 'search',
+        'transitions': [('sees_player', 'chase'), ('hears_player', 'investigate'), ('reached_target', 'search')],
+    },
+    'chase': {
+        'speed': 1.5,
+        'steer': 'steer_pursue',
+        'transitions': [('player_hid_nearby', 'check_hiding_spot'), ('lost_player', 'search')],
+    },
+    'search': {
+        'speed': 0.8,
+        'steer': 'steer_search',
+        'duration': 5000,
+        'timeout': 'patrol',
+        'transitions': [('sees_player', 'chase'), ('hears_player', 'investigate')],
+    },
+    'check_hiding_spot': {
+        'speed': 0.6,
+        'steer': 'steer_to_target',
+        'duration': 4000,
+        'timeout': 'search',
+        'transitions': [('sees_player', 'chase')],
+    },
+}
+
+class ThinkScheduler:
+    """Runs Monster.think for every monster about MONSTER_THINK_RATE times a second.
+
+    Each monster starts at a random phase so the thinks are spread over the
+    frames, and no more than ``budget`` thinks run in one frame; monsters
+    past the budget think on the next frame instead. Movement and animation
+    still happen every frame in Monster.update (or MonsterBatch).
+    """
+
+    def __init__(self, rate=MONSTER_THINK_RATE, budget=MONSTER_THINK_BUDGET):
+        self.interval = max(1000 // rate, 1)
+        self.budget = budget
+        self.queue = []  # (due time, token, monster), a heap ordered by due time
+        self.tokens = itertools.count()
+        self.thinks = 0  # Thinks run by the last update, for profiling
+
+    def add(self, monster, current_time):
+        monster.think_token = next(self.tokens)
+        due = current_time + random.randrange(self.interval)
+        heapq.heappush(self.queue, (due, monster.think_token, monster))
+
+    def remove(self, monster):
+        # The queue entry is dropped when it comes up
+        monster.think_token = None
+
+    def update(self, current_time):
+        self.thinks = 0
+        queue = self.queue
+        while queue and queue[0][0] <= current_time and self.thinks < self.budget:
+            due, token, monster = heapq.heappop(queue)
+            if monster.think_token != token:
+                continue
+            monster.think(current_time)
+            self.thinks += 1
+            if monster.think_token == token:  # Still alive after thinking
+                due += self.interval
+                if due <= current_time:
+                    due = current_time + self.interval  # Fell behind the budget, keep the phase moving
+                heapq.heappush(queue, (due, token, monster))
+
+    def clear(self):
+        self.queue.clear()
@@ -0,0 +1,169 @@
+from settings import *
+
+try:
+    import numpy as np
+except ImportError:  # The batched backend is optional
+    np = None
+
+class MonsterBatch:
+    """Struct-of-arrays simulation of every monster in a level.
+
+    Positions, directions, speeds and animation state live in NumPy arrays
+    indexed by slot and are advanced for all monsters in one step. The
+    Monster sprites remain as thin views: after each step only their rect,
+    image and direction are written back for drawing and collisions. The step
+    follows Monster.update and Monster.animate; decisions still come from
+    Monster.think, which steers its slot through ``steer``.
+    """
+
+    def __init__(self, capacity=64, spatial_index=None):
+        if np is None:
+            raise ImportError("numpy is required for the batched monster backend")
+        self.spatial_index = spatial_index  # Re-bucketed here for moved monsters instead of by sync()
+        self.sprites = []
+        self.free_slots = []
+        self.allocate(capacity)
+
+    def allocate(self, capacity):
+        old_size = len(self.sprites)
+
+        def grow(name, dtype, fill=0):
+            array = np.full(capacity, fill, dtype=dtype)
+            if old_size:
+                array[:old_size] = getattr(self, name)
+            setattr(self, name, array)
+
+        grow('active', bool, False)
+        grow('x', np.float64)
+        grow('y', np.float64)
+        grow('width', np.float64)
+        grow('height', np.float64)
+        grow('direction', np.int8, 1)  # Facing
+        grow('heading_x', np.int8)  # Movement, -1, 0 or 1 per axis
+        grow('heading_y', np.int8)
+        grow('speed', np.float64)
+        grow('animation_time', np.float64)
+        grow('animation_interval', np.float64, 200)
+        grow('frame', np.int64)
+        grow('movement_frames', np.int64, 1)
+        grow('attack_frames', np.int64, 1)
+        grow('attacking', bool, False)
+        grow('player_distance', np.float64, np.inf)  # Read by Monster.perceive
+        grow('dirty', bool, False)  # Sprite view needs to be written back
+        self.sprites.extend([None] * (capacity - old_size))
+        self.free_slots.extend(range(capacity - 1, old_size - 1, -1))
+
+    def add(self, monster):
+        if not self.free_slots:
+            self.allocate(len(self.sprites) * 2)
+        slot = self.free_slots.pop()
+        self.sprites[slot] = monster
+        monster.batch = self
+        monster.batch_slot = slot
+
+        self.active[slot] = True
+        self.x[slot] = monster.x
+        self.y[slot] = monster.y
+        self.width[slot] = monster.rect.width
+        self.height[slot] = monster.rect.height
+        self.direction[slot] = monster.direction
+        self.heading_x[slot], self.heading_y[slot] = monster.heading
+        self.speed[slot] = monster.speed
+        self.animation_time[slot] = monster.animation_time
+        self.animation_interval[slot] = monster.animation_interval
+        self.frame[slot] = monster.current_frame
+        self.movement_frames[slot] = len(monster.movement_frames)
+        self.attack_frames[slot] = len(monster.attack_frames)
+        self.attacking[slot] = monster.is_attacking
+        self.dirty[slot] = True
+
+    def remove(self, monster):
+        slot = getattr(monster, 'batch_slot', None)
+        if slot is None or self.sprites[slot] is not monster:
+            return
+        self.active[slot] = False
+        self.sprites[slot] = None
+        self.free_slots.append(slot)
+        monster.batch = None
+        monster.batch_slot = None
+
+    def __len__(self):
+        return int(self.active.sum())
+
+    def steer(self, slot, direction, speed, heading):
+        self.direction[slot] = direction
+        self.heading_x[slot], self.heading_y[slot] = heading
+        self.speed[slot] = speed
+        self.dirty[slot] = True
+
+    def start_attack(self, slot):
+        self.attacking[slot] = True
+        self.frame[slot] = 0
+        self.dirty[slot] = True
+
+    def update(self, time_delta, player_rect, world_rect):
+        active = self.active
+        if not active.any():
+            return
+
+        previous_x = self.x.astype(np.int64)
+        previous_y = self.y.astype(np.int64)
+        previous_direction = self.direction.copy()
+
+        step = self.speed[active] * (time_delta * FPS)
+        self.x[active] += step * self.heading_x[active]
+        self.y[active] += step * self.heading_y[active]
+
+        # Keep the monsters within the level bounds
+        too_far_left = active & (self.x < world_rect.left)
+        self.x[too_far_left] = world_rect.left
+        self.direction[too_far_left] = 1
+        self.heading_x[too_far_left] = 1
+        too_far_right = active & (self.x + self.width > world_rect.right)
+        self.x[too_far_right] = world_rect.right - self.width[too_far_right]
+        self.direction[too_far_right] = -1
+        self.heading_x[too_far_right] = -1
+        np.clip(self.y, world_rect.top, world_rect.bottom - self.height, out=self.y, where=active)
+
+        # Animation
+        self.animation_time[active] += time_delta * 1000
+        advancing = active & (self.animation_time > self.animation_interval)
+        self.animation_time[advancing] = 0
+        frame_count = np.where(self.attacking, self.attack_frames, self.movement_frames)
+        self.frame[advancing] = (self.frame[advancing] + 1) % frame_count[advancing]
+        self.attacking[advancing & self.attacking & (self.frame == 0)] = False
+
+        # Distance to the player, for every monster at once
+        center_x = self.x.astype(np.int64) + self.width // 2
+        center_y = self.y.astype(np.int64) + self.height // 2
+        self.player_distance[active] = np.hypot(player_rect.centerx - center_x[active],
+                                                player_rect.centery - center_y[active])
+
+        # Only sprites whose position or frame changed are touched
+        moved = active & ((self.x.astype(np.int64) != previous_x) | (self.y.astype(np.int64) != previous_y))
+        self.dirty |= active & (advancing | moved | (self.direction != previous_direction))
+        self.write_back(moved)
+
+    def write_back(self, moved=None):
+        slots = np.flatnonzero(self.dirty)
+        if not len(slots):
+            return
+        self.dirty[slots] = False
+        positions = self.x[slots].tolist()
+        ys = self.y[slots].tolist()
+        directions = self.direction[slots].tolist()
+        frames = self.frame[slots].tolist()
+        attacking = self.attacking[slots].tolist()
+        for i, slot in enumerate(slots.tolist()):
+            sprite = self.sprites[slot]
+            sprite.x = positions[i]
+            sprite.y = ys[i]
+            sprite.rect.topleft = (int(positions[i]), int(ys[i]))
+            sprite.direction = directions[i]
+            sprite.current_frame = frames[i]
+            sprite.is_attacking = attacking[i]
+            frames_for_direction = sprite.frame_table[directions[i] > 0]['attack' if attacking[i] else 'movement']
+            sprite.image = frames_for_direction[frames[i] % len(frames_for_direction)]
+        if self.spatial_index is not None and moved is not None:
+            for slot in np.flatnonzero(moved).tolist():
+                self.spatial_index.update(self.sprites[slot])
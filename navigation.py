@@ -0,0 +1,143 @@
+from collections import deque
+from settings import *
+from asset_cache import LRUCache
+
+class NavGrid:
+    """Coarse walkability grid of a level with cached flow fields.
+
+    A cell is blocked when an obstacle overlaps it. Moving left or right is
+    allowed between any two open cells, moving up or down only when one of
+    the two cells has its center in a vertical zone. A flow field holds the
+    number of steps from every cell to a target cell (a breadth-first search
+    out of the target) and is cached per target cell.
+
+    The field toward the player is shared by every monster and rebuilt by
+    ``track`` only when the player enters a cell whose field is not cached.
+    The rebuild expands at most NAV_SEARCH_BUDGET cells per frame; until it
+    finishes, monsters keep following the previous field.
+    """
+
+    def __init__(self, world_rect, obstacles=(), vertical_zones=(), cell_size=NAV_CELL_SIZE,
+                 cache_size=NAV_FIELD_CACHE_SIZE):
+        self.cell_size = cell_size
+        self.left, self.top = world_rect.topleft
+        self.columns = max(1, -(-world_rect.width // cell_size))
+        self.rows = max(1, -(-world_rect.height // cell_size))
+        self.fields = LRUCache(cache_size)  # target cell index -> steps to it from every cell, -1 if unreachable
+        self.builds = 0
+        self.tracked_cell = None  # Cell of the tracked position (the player)
+        self.tracked_field = None  # Latest finished field toward a tracked cell
+        self.search = None  # (target, steps, frontier) of the field being built by track()
+
+        self.open = bytearray([1]) * (self.columns * self.rows)
+        for rect in obstacles:
+            left, top, right, bottom = self.cell_range(rect)
+            for row in range(top, bottom + 1):
+                for column in range(left, right + 1):
+                    self.open[row * self.columns + column] = 0
+
+        climbable = bytearray(self.columns * self.rows)
+        for row in range(self.rows):
+            for column in range(self.columns):
+                center = (self.left + column * cell_size + cell_size // 2, self.top + row * cell_size + cell_size // 2)
+                if any(zone.collidepoint(center) for zone in vertical_zones):
+                    climbable[row * self.columns + column] = 1
+
+        # Open neighbors of every cell, horizontal ones first so ties favour walking
+        self.neighbors = []
+        for index in range(self.columns * self.rows):
+            row, column = divmod(index, self.columns)
+            cells = []
+            if column > 0:
+                cells.append(index - 1)
+            if column < self.columns - 1:
+                cells.append(index + 1)
+            for other in (index - self.columns if row > 0 else None,
+                          index + self.columns if row < self.rows - 1 else None):
+                if other is not None and (climbable[index] or climbable[other]):
+                    cells.append(other)
+            self.neighbors.append(tuple(cell for cell in cells if self.open[cell]))
+
+    def cell_range(self, rect):
+        size = self.cell_size
+        return (max((rect.left - self.left) // size, 0),
+                max((rect.top - self.top) // size, 0),
+                min((rect.right - 1 - self.left) // size, self.columns - 1),
+                min((rect.bottom - 1 - self.top) // size, self.rows - 1))
+
+    def cell_at(self, position):
+        column = min(max(int(position[0] - self.left) // self.cell_size, 0), self.columns - 1)
+        row = min(max(int(position[1] - self.top) // self.cell_size, 0), self.rows - 1)
+        return row * self.columns + column
+
+    def is_open(self, position):
+        return bool(self.open[self.cell_at(position)])
+
+    def start_search(self, target):
+        steps = [-1] * len(self.open)
+        steps[target] = 0
+        return (target, steps, deque([target]))
+
+    def expand(self, search, budget=None):
+        """Run the search for up to ``budget`` cells, returns True once the field is complete."""
+        target, steps, frontier = search
+        neighbors = self.neighbors
+        while frontier and budget != 0:
+            cell = frontier.popleft()
+            next_steps = steps[cell] + 1
+            for other in neighbors[cell]:
+                if steps[other] < 0:
+                    steps[other] = next_steps
+                    frontier.append(other)
+            if budget is not None:
+                budget -= 1
+        if frontier:
+            return False
+        self.fields.put(target, steps)
+        self.builds += 1
+        return True
+
+    def field(self, target):
+        steps = self.fields.get(target)
+        if steps is None:
+            search = self.start_search(target)
+            self.expand(search)
+            steps = search[1]
+        return steps
+
+    def track(self, position, budget=NAV_SEARCH_BUDGET):
+        cell = self.cell_at(position)
+        if cell != self.tracked_cell:
+            self.tracked_cell = cell
+            steps = self.fields.get(cell)
+            if steps is not None:
+                self.tracked_field = steps
+                self.search = None
+            else:
+                self.search = self.start_search(cell)
+        if self.search and self.expand(self.search, budget):
+            self.tracked_field = self.search[1]
+            self.search = None
+
+    def step(self, position, target_position):
+        """(dx, dy) toward the neighbor cell closest to the target, each -1, 0 or 1.
+
+        None when already in the target cell or when no path is known.
+        """
+        cell = self.cell_at(position)
+        target = self.cell_at(target_position)
+        if cell == target:
+            return None
+        if target == self.tracked_cell and self.tracked_field is not None:
+            steps = self.tracked_field  # Possibly still the field of the previous cell
+        else:
+            steps = self.field(target)
+        best, best_steps = None, steps[cell] if steps[cell] >= 0 else len(steps)
+        for other in self.neighbors[cell]:
+            if 0 <= steps[other] < best_steps:
+                best, best_steps = other, steps[other]
+        if best is None:
+            return None
+        if best == cell - 1 or best == cell + 1:
+            return (best - cell, 0)
+        return (0, 1 if best > cell else -1)
@@ -0,0 +1,62 @@
+from collections import deque
+from settings import *
+from navigation import NavGrid
+
+class NoiseField:
+    """Coarse grid of how loud each part of the level is, for monster hearing.
+
+    Sounds are emitted as events and spread out from their cell one
+    neighbour at a time, losing NOISE_FALLOFF per cell. Obstacles stop them,
+    so a sound reaches the far side of a wall only by going around it. Each
+    cell keeps the loudest level that reached it and where that sound came
+    from, and levels fade by NOISE_DECAY per second. Listeners read a single
+    cell however many sounds were made.
+    """
+
+    def __init__(self, world_rect, obstacles=(), cell_size=NOISE_CELL_SIZE):
+        # Sound spreads in every direction, so the whole world counts as a vertical zone
+        everywhere = world_rect.inflate(cell_size * 2, cell_size * 2)
+        self.grid = NavGrid(world_rect, obstacles, [everywhere], cell_size=cell_size, cache_size=1)
+        self.levels = {}  # cell -> loudness, only cells that are not silent
+        self.sources = {}  # cell -> position of the sound heard there
+        self.pending = {}  # cell -> (loudness, position) emitted since the last update
+
+    def emit(self, position, loudness):
+        cell = self.grid.cell_at(position)
+        if loudness > self.pending.get(cell, (0, None))[0]:
+            self.pending[cell] = (loudness, position)
+
+    def update(self, time_delta):
+        levels, sources = self.levels, self.sources
+        decay = NOISE_DECAY * time_delta
+        for cell, loudness in list(levels.items()):
+            if loudness > decay:
+                levels[cell] = loudness - decay
+            else:
+                del levels[cell]
+                del sources[cell]
+
+        neighbors = self.grid.neighbors
+        for cell, (loudness, position) in self.pending.items():
+            frontier = deque([(cell, loudness)])
+            while frontier:
+                cell, loudness = frontier.popleft()
+                if loudness <= levels.get(cell, 0):
+                    continue  # A louder sound already covers this cell and everything it spreads to
+                levels[cell] = loudness
+                sources[cell] = position
+                loudness -= NOISE_FALLOFF
+                if loudness > 0:
+                    frontier.extend((other, loudness) for other in neighbors[cell])
+        self.pending.clear()
+
+    def level_at(self, position):
+        return self.levels.get(self.grid.cell_at(position), 0)
+
+    def source_at(self, position):
+        return self.sources.get(self.grid.cell_at(position))
+
+    def clear(self):
+        self.levels.clear()
+        self.sources.clear()
+        self.pending.clear()
@@ -1,59 +1,37 @@
 import pygame
 from settings import *
-import random
-import time
+import game_clock
+from asset_cache import asset_cache
 
 class Player(pygame.sprite.Sprite):
     def __init__(self, position, groups):
         super().__init__(groups)
         
-        try:
-            # Load character sprites
-            self.standing_image = pygame.image.load('assets/images/main_char.png').convert_alpha()
-            self.moving_spritesheet = pygame.image.load('assets/images/main_char_move.png').convert_alpha()
-            self.death_spritesheet = pygame.image.load('assets/images/death.png').convert_alpha()
-        except pygame.error as e:
-            print(f"Error loading player images: {e}")
-            # Create placeholder images
-            self.standing_image = pygame.Surface((32, 48))
-            self.standing_image.fill((255, 0, 0))  # Red placeholder
-            self.moving_spritesheet = pygame.Surface((128, 48))
-            self.moving_spritesheet.fill((0, 255, 0))  # Green placeholder
-            self.death_spritesheet = pygame.Surface((128, 48))
-            self.death_spritesheet.fill((0, 0, 255))  # Blue placeholder
-        
         # Scale images to 1/4 of their original size
         scale_factor = 0.375  # This is 0.25 * 1.5, making the sprite 1.5 times bigger than before
-        self.standing_image = pygame.transform.scale(self.standing_image, 
-                                                     (int(self.standing_image.get_width() * scale_factor), 
-                                                      int(self.standing_image.get_height() * scale_factor)))
-        self.moving_spritesheet = pygame.transform.scale(self.moving_spritesheet, 
-                                                         (int(self.moving_spritesheet.get_width() * scale_factor), 
-                                                          int(self.moving_spritesheet.get_height() * scale_factor)))
-        self.death_spritesheet = pygame.transform.scale(self.death_spritesheet,
-                                                        (int(self.death_spritesheet.get_width() * scale_factor),
-                                                         int(self.death_spritesheet.get_height() * scale_factor)))
-        
-        # Set up animation frames
-        self.frame_width = self.moving_spritesheet.get_width() // 4
-        self.frame_height = self.moving_spritesheet.get_height()
-        self.animation_frames = [
-            self.moving_spritesheet.subsurface((i * self.frame_width, 0, self.frame_width, self.frame_height))
-            for i in range(4)
-        ]
-        
-        # Set up death animation frames
-        self.death_frame_width = self.death_spritesheet.get_width() // 4  # Assuming 4 frames in the death animation
-        self.death_frame_height = self.death_spritesheet.get_height()
-        self.death_frames = [
-            self.death_spritesheet.subsurface((i * self.death_frame_width, 0, self.death_frame_width, self.death_frame_height))
-            for i in range(4)
-        ]
+
+        # Indexed as frame_table[facing_right][state][frame]; the sprites face right,
+        # so facing left uses the mirrored frames
+        self.frame_table = {facing_right: self.load_frames(scale_factor, flip=not facing_right)
+                            for facing_right in (False, True)}
+        self.standing_image = self.frame_table[True]['standing'][0]
+        self.animation_frames = self.frame_table[True]['moving']
+        self.death_frames = self.frame_table[True]['death']
         
         # Set initial image and rect
         self.image = self.standing_image
         self.rect = self.image.get_rect(center=position)
-        
+        self.start_position = position
+
+        self.level = None  # Will be set after player creation
+        self.get_keys = pygame.key.get_pressed  # Replaced by scripted input in headless runs
+        self.reset()
+
+    def reset(self):
+        # Back to the state the player spawned in; frames, level and input stay
+        self.image = self.standing_image
+        self.rect.center = self.start_position
+
         # Animation variables
         self.facing_right = True
         self.is_moving = False
@@ -70,31 +48,49 @@ class Player(pygame.sprite.Sprite):
         self.health = PLAYER_HEALTH
         self.stamina = PLAYER_STAMINA
         self.noise_level = 0
+        self.noise_timer = 0
 
         self.velocity = pygame.math.Vector2(0, 0)
         self.is_running = False
-        self.is_hidden = False
         self.hiding_spot = None
         self.is_hiding = False
         self.hide_start_time = None
-        self.is_qte_active = False
-        self.qte_target_key = None
-        self.qte_start_time = None
-        self.qte_time_limit = 2  # 2 seconds to respond
 
         self.inventory = []  # List to hold up to 4 items
         self.notes = []  # List to hold collected notes and manuals
 
-        self.level = None  # Will be set after player creation
-
         self.hiding_cooldown = 0  # Add a cooldown for hiding
 
-        # Keep a copy of the original image for restoring later
-        self.original_image = self.image.copy()
+        # Hiding only turns drawing off, the shared frame surfaces are never modified
+        self.visible = True
+
+    def load_frames(self, scale_factor, flip):
+        try:
+            # Load character sprites, shared between respawns through the asset cache
+            return {
+                'standing': (asset_cache.get_image('assets/images/main_char.png', scale=scale_factor, flip=flip),),
+                'moving': asset_cache.get_frames('assets/images/main_char_move.png', 4, scale=scale_factor, flip=flip),
+                # Assuming 4 frames in the death animation
+                'death': asset_cache.get_frames('assets/images/death.png', 4, scale=scale_factor, flip=flip),
+            }
+        except pygame.error as e:
+            print(f"Error loading player images: {e}")
+            # Create placeholder images
+            standing_image = pygame.Surface((32, 48))
+            standing_image.fill((255, 0, 0))  # Red placeholder
+            moving_frame = pygame.Surface((32, 48))
+            moving_frame.fill((0, 255, 0))  # Green placeholder
+            death_frame = pygame.Surface((32, 48))
+            death_frame.fill((0, 0, 255))  # Blue placeholder
+            return {
+                'standing': (asset_cache.transform(standing_image, scale=scale_factor, flip=flip),),
+                'moving': (asset_cache.transform(moving_frame, scale=scale_factor, flip=flip),) * 4,
+                'death': (asset_cache.transform(death_frame, scale=scale_factor, flip=flip),) * 4,
+            }
 
     def handle_input(self):
         if not self.is_hiding:
-            keys = pygame.key.get_pressed()
+            keys = self.get_keys()
             self.velocity = pygame.math.Vector2(0, 0)
             self.is_running = keys[KEY_RUN]
             self.is_moving = False
@@ -150,30 +146,25 @@ class Player(pygame.sprite.Sprite):
         if not self.is_hiding and self.hiding_cooldown == 0:
             self.is_hiding = True
             self.hiding_spot = hiding_spot
-            self.image.set_alpha(0)  # Make player fully transparent
-            self.hide_start_time = pygame.time.get_ticks()
+            self.visible = False  # Skip the player when drawing
+            self.hide_start_time = game_clock.get_ticks()
             self.hiding_cooldown = 60  # Cooldown
-
-            # Ensure the alpha value is applied to the image correctly
-            self.image = self.image.convert_alpha()
+            self.emit_noise(NOISE_HIDE_LOUDNESS)
 
     def unhide(self):
         if self.is_hiding:
             self.is_hiding = False
             self.hiding_spot = None
-            self.image.set_alpha(255)  # Make player fully visible
+            self.visible = True  # Draw the player again
             self.hide_start_time = None
-            self.is_qte_active = False
             self.hiding_cooldown = 60  # Cooldown
-
-            # Ensure the alpha value is applied to the image correctly
-            self.image = self.image.convert_alpha()
+            self.emit_noise(NOISE_HIDE_LOUDNESS)
 
     def toggle_hide(self):
         if self.is_hiding:
             self.unhide()
         else:
-            self.check_hiding_spot(self.level.interactables)
+            self.check_hiding_spot(self.level.spatial_index.query(self.rect, 'interactables'))
             if self.hiding_spot:
                 self.hide(self.hiding_spot)
             else:
@@ -185,12 +176,18 @@ class Player(pygame.sprite.Sprite):
         else:
             self.handle_input()
             if not self.is_hiding:
-                self.image.set_alpha(255)  # Ensure player is visible
+                self.visible = True  # Ensure player is visible
                 self.rect.x += self.velocity.x
                 self.rect.y += self.velocity.y
-                self.rect.clamp_ip(pygame.Rect(0, 0, WINDOW_WIDTH, WINDOW_HEIGHT))
+                self.rect.clamp_ip(self.level.world_rect if self.level else pygame.Rect(0, 0, WINDOW_WIDTH, WINDOW_HEIGHT))
                 self.hide_start_time = None
-                self.is_qte_active = False
+
+                # Footsteps are heard through the level's noise field
+                self.noise_timer += time_delta
+                if self.noise_timer >= NOISE_EMIT_INTERVAL:
+                    self.noise_timer = 0
+                    if self.noise_level:
+                        self.emit_noise(self.noise_level)
                 
                 # Update animation
                 self.animate()
@@ -199,74 +196,30 @@ class Player(pygame.sprite.Sprite):
                 self.is_moving = False
                 self.current_frame = 0
 
+    def emit_noise(self, loudness):
+        if self.level is not None:
+            self.level.noise_field.emit(self.rect.center, loudness)
+
     def animate_death(self):
-        current_time = pygame.time.get_ticks()
+        current_time = game_clock.get_ticks()
         if current_time - self.death_animation_time > self.death_animation_interval:
             self.death_animation_time = current_time
             self.current_death_frame += 1
             if self.current_death_frame >= len(self.death_frames):
                 self.current_death_frame = len(self.death_frames) - 1  # Stay on the last frame
-            self.image = self.death_frames[self.current_death_frame]
+            self.image = self.frame_table[self.facing_right]['death'][self.current_death_frame]
 
     def animate(self):
-        current_time = pygame.time.get_ticks()
+        current_time = game_clock.get_ticks()
+        frames = self.frame_table[self.facing_right]
         
         if self.is_moving:
             if current_time - self.animation_time > self.animation_interval:
                 self.animation_time = current_time
                 self.current_frame = (self.current_frame + 1) % 4
-                self.image = self.animation_frames[self.current_frame]
+            self.image = frames['moving'][self.current_frame]
         else:
-            self.image = self.standing_image
-        
-        # Correct the image flipping logic
-        if not self.facing_right:
-            flipped_image = pygame.transform.flip(self.image, True, False)
-            self.image = flipped_image
-        # No need to flip when facing right
-
-    def check_monster_proximity(self):
-        # Check if any monster is nearby
-        for monster in self.level.monsters:
-            distance = pygame.math.Vector2(self.rect.center).distance_to(monster.rect.center)
-            if distance < monster.check_hiding_spot_radius:
-                # Monster is close enough to check the hiding spot
-                chance_to_check = 0.005  # Adjust chance as needed
-                if random.random() < chance_to_check:
-                    self.start_qte()
-
-    def start_qte(self):
-        if not self.is_qte_active:
-            self.is_qte_active = True
-            self.qte_target_key = random.choice(QTE_KEYS)
-            self.qte_start_time = pygame.time.get_ticks()
-            # Provide visual cue for QTE (e.g., display the target key)
-            print(get_text("qte_prompt").format(pygame.key.name(self.qte_target_key)))
-
-    def handle_qte(self):
-        current_time = pygame.time.get_ticks()
-        if current_time - self.qte_start_time <= self.qte_time_limit * 1000:
-            # Wait for player input
-            for event in self.level.events:
-                if event.type == pygame.KEYDOWN:
-                    if event.key == self.qte_target_key:
-                        # QTE success
-                        self.is_qte_active = False
-                        print(get_text("qte_success"))
-                        break
-                    else:
-                        # QTE failed
-                        self.is_qte_active = False
-                        self.is_hiding = False
-                        self.image.fill(WHITE)
-                        print(get_text("qte_failure"))
-                        break
-        else:
-            # QTE timed out
-            self.is_qte_active = False
-            self.is_hiding = False
-            self.image.fill(WHITE)
-            print(get_text("qte_timeout"))
+            self.image = frames['standing'][0]
 
     def check_hiding_spot(self, hiding_spots):
         # Check if player is colliding with any hiding spots
@@ -276,28 +229,6 @@ class Player(pygame.sprite.Sprite):
                 return
         self.hiding_spot = None
 
-    def quick_time_event(self):
-        if self.is_hidden and random.random() < 0.05:  # 5% chance of triggering QTE when hidden
-            target_key = random.choice(QTE_KEYS)
-            start_time = time.time()
-            
-            print(get_text("quick_time_event").format(pygame.key.name(target_key)))
-
-            while time.time() - start_time < 2:  # 2-second window to respond
-                for event in pygame.event.get():
-                    if event.type == pygame.KEYDOWN:
-                        if event.key == target_key:
-                            print("Success!")
-                            return True
-                        else:
-                            print("Failed!")
-                            self.is_hidden = False
-                            return False
-            
-            print("Too slow!")
-            self.is_hidden = False
-            return False
-
     def add_to_inventory(self, item):
         if len(self.inventory) < 4:
             self.inventory.append(item)
@@ -320,7 +251,7 @@ class Player(pygame.sprite.Sprite):
 
     def die(self):
         self.is_dying = True
-        self.death_animation_time = pygame.time.get_ticks()
+        self.death_animation_time = game_clock.get_ticks()
         print(get_text("game_over"))
 
     def heal(self, amount):
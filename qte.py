@@ -0,0 +1,83 @@
+import pygame
+import random
+from settings import *
+from text_cache import text_cache
+
+class QuickTimeEvent:
+    """Press the shown key before time runs out, without blocking the game loop.
+
+    States: 'idle' -> 'active' -> 'success', 'failure' or 'timeout', and back
+    to 'idle' once the result has been on screen for QTE_RESULT_DURATION.
+    Key presses arrive through ``handle_event`` from the main event loop and
+    time through ``update(time_delta)``, so the frame keeps running and the
+    time limit does not depend on the frame rate. Any key other than the
+    target counts as a failure, except ESC which the game already uses.
+    ``on_finish(result, source)`` is called once the result is known.
+    """
+
+    def __init__(self, on_finish=None, time_limit=QTE_TIME_LIMIT):
+        self.on_finish = on_finish
+        self.time_limit = time_limit
+        self.reset()
+
+    def reset(self):
+        self.state = 'idle'
+        self.target_key = None
+        self.source = None  # Whatever started the event, e.g. the monster checking the hiding spot
+        self.remaining = 0
+
+    @property
+    def is_active(self):
+        return self.state == 'active'
+
+    def start(self, source=None, target_key=None):
+        if self.is_active:
+            return False
+        self.state = 'active'
+        self.target_key = target_key if target_key is not None else random.choice(QTE_KEYS)
+        self.source = source
+        self.remaining = self.time_limit
+        return True
+
+    def handle_event(self, event):
+        # Returns True when the event was used up by the quick time event
+        if not self.is_active or event.type != pygame.KEYDOWN or event.key == pygame.K_ESCAPE:
+            return False
+        self.finish('success' if event.key == self.target_key else 'failure')
+        return True
+
+    def update(self, time_delta):
+        if self.state == 'idle':
+            return
+        self.remaining -= time_delta
+        if self.is_active:
+            if self.remaining <= 0:
+                self.finish('timeout')
+        elif self.remaining <= 0:
+            self.reset()
+
+    def finish(self, result):
+        self.state = result
+        self.remaining = QTE_RESULT_DURATION
+        if self.on_finish:
+            self.on_finish(result, self.source)
+
+    def draw(self, surface):
+        # Returns the screen area drawn, None when nothing is shown
+        if self.state == 'idle':
+            return None
+        center = (WINDOW_WIDTH // 2, WINDOW_HEIGHT // 3)
+        if self.is_active:
+            text = get_text("quick_time_event").format(pygame.key.name(self.target_key).upper())
+            text_surface = text_cache.render(text, 48, RED)
+        else:
+            text_surface = text_cache.render(get_text(f"qte_{self.state}"), 48,
+                                             WHITE if self.state == 'success' else RED)
+        rect = surface.blit(text_surface, text_surface.get_rect(center=center))
+        if self.is_active:
+            bar = pygame.Rect(0, 0, 300, 12)
+            bar.midtop = (center[0], rect.bottom + 10)
+            pygame.draw.rect(surface, WHITE, bar, 1)
+            pygame.draw.rect(surface, RED, (bar.x, bar.y, int(bar.width * max(self.remaining, 0) / self.time_limit), bar.height))
+            rect = rect.union(bar)
+        return rect
@@ -0,0 +1,60 @@
+import pygame
+from settings import *
+
+class DirtyRectRenderer:
+    """Tracks what was drawn last frame and reports only the screen areas that changed.
+
+    Every frame the areas drawn in the previous frame are restored with ``erase``
+    and all items are drawn again on top, so overlapping sprites always compose
+    correctly. Only items whose rect or signature changed are returned as dirty
+    rects for ``pygame.display.update``; items added with a ``None`` signature
+    are treated as changed every frame. When the items cover more than
+    DIRTY_RECT_FULL_THRESHOLD of the screen (e.g. crowds of monsters) one full
+    redraw is cheaper than erasing and updating every rect separately.
+    """
+
+    def __init__(self, erase):
+        self.erase = erase  # erase(surface, rect) restores the background under rect
+        self.screen_rect = pygame.Rect(0, 0, WINDOW_WIDTH, WINDOW_HEIGHT)
+        self.previous = {}
+        self.current = {}
+        self.full_redraw = True
+
+    def invalidate(self):
+        self.full_redraw = True
+
+    def begin(self, surface):
+        covered = sum(rect.w * rect.h for rect, _ in self.previous.values())
+        if covered > self.screen_rect.w * self.screen_rect.h * DIRTY_RECT_FULL_THRESHOLD:
+            self.full_redraw = True
+        if self.full_redraw:
+            self.erase(surface, self.screen_rect)
+        else:
+            for rect, _ in self.previous.values():
+                self.erase(surface, rect)
+        self.current = {}
+
+    def add(self, slot, rect, signature=None):
+        if rect:
+            rect = rect.clip(self.screen_rect)
+            if rect:
+                self.current[slot] = (rect, signature)
+
+    def end(self):
+        if self.full_redraw:
+            self.full_redraw = False
+            dirty_rects = [self.screen_rect.copy()]
+        else:
+            dirty_rects = []
+            for slot, (rect, signature) in self.current.items():
+                previous = self.previous.get(slot)
+                if previous is None:
+                    dirty_rects.append(rect)
+                elif signature is None or previous[1] != signature or previous[0] != rect:
+                    dirty_rects.append(rect)
+                    dirty_rects.append(previous[0])
+            for slot, (rect, _) in self.previous.items():
+                if slot not in self.current:
+                    dirty_rects.append(rect)
+        self.previous = self.current
+        return dirty_rects
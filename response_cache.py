@@ -0,0 +1,123 @@
+import hashlib
+import json
+import os
+import threading
+from settings import *
+
+class CacheMiss(Exception):
+    """Raised in replay mode when a response is not in the cache."""
+
+class ResponseCache:
+    """Content-addressed on-disk cache for responses of the paid AI APIs.
+
+    Entries are keyed by a hash of the kind of request, the model, the prompt
+    and the generation parameters. Modes:
+      'readwrite' - return cached responses and store new ones
+      'replay'    - only return cached responses, never call the APIs (offline play)
+      'off'       - always call the APIs
+    The least recently used entries are removed once the cache grows past max_bytes.
+    """
+
+    def __init__(self, directory=AI_CACHE_DIR, max_bytes=AI_CACHE_MAX_BYTES, mode=AI_CACHE_MODE):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.mode = mode
+        self.total_bytes = None  # Size of the cache directory, measured on the first write
+        self.lock = threading.Lock()  # Chat and voice requests run on worker threads
+
+    @property
+    def enabled(self):
+        return self.mode in ('readwrite', 'replay')
+
+    @property
+    def replay_only(self):
+        return self.mode == 'replay'
+
+    def key(self, kind, model, prompt, params=None):
+        payload = json.dumps({"kind": kind, "model": model, "prompt": prompt, "params": params or {}},
+                             sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def path(self, key, suffix):
+        return os.path.join(self.directory, key[:2], key + suffix)
+
+    def lookup(self, key, suffix):
+        if not self.enabled:
+            return None
+        path = self.path(key, suffix)
+        if not os.path.exists(path):
+            if self.replay_only:
+                raise CacheMiss(f"no cached response for {key} (replay mode)")
+            return None
+        os.utime(path)  # Mark as recently used
+        return path
+
+    def get_text(self, key):
+        path = self.lookup(key, '.txt')
+        if path is None:
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            return f.read()
+
+    def put_text(self, key, text):
+        return self.put_bytes(key, text.encode('utf-8'), '.txt')
+
+    def get_file(self, key, suffix):
+        return self.lookup(key, suffix)
+
+    def put_bytes(self, key, data, suffix):
+        if self.mode != 'readwrite':
+            return None
+        path = self.path(key, suffix)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+        with self.lock:
+            if self.total_bytes is None:
+                self.total_bytes = self.scan()[1]
+            try:
+                replaced = os.path.getsize(path)
+            except OSError:
+                replaced = 0
+            os.replace(temp_path, path)
+            self.total_bytes += len(data) - replaced
+            full = self.total_bytes > self.max_bytes
+        if full:
+            self.evict()
+        return path
+
+    def contains_path(self, path):
+        return os.path.abspath(path).startswith(os.path.abspath(self.directory) + os.sep)
+
+    def scan(self):
+        # (mtime, size, path) of every entry and their total size; walks the whole directory
+        entries = []
+        total = 0
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith('.tmp'):
+                    continue
+                path = os.path.join(root, name)
+                stat = os.stat(path)
+                entries.append((stat.st_mtime, stat.st_size, path))
+                total += stat.st_size
+        return entries, total
+
+    def evict(self):
+        # Only called once the running total is over the limit. Trimming to 90% of
+        # it leaves room for more writes before the directory has to be walked again
+        with self.lock:
+            entries, total = self.scan()
+            entries.sort()
+            for _, size, path in entries:
+                if total <= self.max_bytes * 0.9:
+                    break
+                try:
+                    os.remove(path)
+                    total -= size
+                except OSError:
+                    pass
+            self.total_bytes = total
+
+response_cache = ResponseCache()
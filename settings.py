@@ -1,5 +1,6 @@
 import pygame
 import json
+import os
 
 # Admin mode settings
 ADMIN_MODE = True  # Set this to True to enable admin mode
@@ -11,11 +12,47 @@ AI_MODE = False  # Set this to True to enable AI mode
 STORY_GENERATION = False  # Set this to True to enable story generation
 MUSIC_GENERATION = False  # Set this to True to enable music generation
 VOICE_GENERATION = False  # Set this to True to enable voice generation
+INTRO_VOICE_PREFETCH = 2  # Story cards ahead of the current one whose voice is generated in the background
+INTRO_LOADING_TEXT = "Receiving transmission..."
+
+# AI response cache: 'readwrite' reuses and stores responses, 'replay' only plays
+# back cached ones without calling the APIs (offline), 'off' disables the cache
+AI_CACHE_MODE = os.environ.get("AI_CACHE_MODE", "readwrite")
+AI_CACHE_DIR = '.ai_cache'
+AI_CACHE_MAX_BYTES = 200 * 1024 * 1024
+
+# First level of a new game
+START_LEVEL = 'assets/levels/level1.json'
 
 # Window settings
 WINDOW_WIDTH = 1280
 WINDOW_HEIGHT = 720
 FPS = 60
+# 'full' redraws and flips the whole screen every frame, 'dirty' only updates
+# the areas that changed (overlays such as the code task still redraw fully)
+RENDER_MODE = 'full'
+DIRTY_RECT_FULL_THRESHOLD = 0.5  # Fraction of the screen covered by sprites above which dirty mode redraws everything
+SHOW_PERF_STATS = False  # Show the HUD rebuild counter
+
+# Asset cache settings
+ASSET_CACHE_SIZE = 64  # Maximum number of decoded/transformed images kept in memory
+TEXT_CACHE_SIZE = 256  # Maximum number of rendered text surfaces kept in memory
+SPATIAL_HASH_CELL_SIZE = 128  # Cell size in pixels of the level's spatial index
+NAV_CELL_SIZE = 40  # Cell size in pixels of the monster navigation grid
+NAV_FIELD_CACHE_SIZE = 16  # Flow fields kept per level, one per target cell
+NAV_SEARCH_BUDGET = 2000  # Cells the flow field toward the player expands per frame
+USE_SPRITE_ATLAS = True  # Serve sprite frames from the pre-built atlas when it exists
+SPRITE_ATLAS_PATH = 'assets/atlas/sprites.json'  # Built by build_atlas.py
+ATLAS_MAX_WIDTH = 2048
+ATLAS_MAX_SPRITE_SIZE = 512  # Larger single images (backgrounds, death screen) stay out of the atlas
+USE_COMPILED_LEVELS = True  # Load levels from the artifacts of level_compiler.py when they are up to date
+COMPILED_LEVELS_DIR = 'assets/compiled'
+
+# Camera settings
+CAMERA_MARGIN = 200  # Sprites this close to the viewport still update every frame
+OFFSCREEN_UPDATE_INTERVAL = 0.25  # Seconds between updates of sprites far from the viewport
+TILE_CHUNK_SIZE = 8  # Tiled backgrounds are pre-rendered in chunks of this many tiles per side
+TILE_CHUNK_CACHE_SIZE = 64  # Maximum number of pre-rendered chunks kept in memory
 
 # Player settings
 PLAYER_SPEED = 5
@@ -23,17 +60,33 @@ PLAYER_HEALTH = 5
 PLAYER_STAMINA = 100
 
 # Monster settings
-MONSTER_SPEED = 3
+MONSTER_SPEED = 3  # Pixels per frame at FPS
 MONSTER_DETECTION_RADIUS = 200
 MONSTER_NOISE_THRESHOLD = 50
 MONSTER_SPAWN_INTERVAL = 20000  # 20 seconds in milliseconds
 MONSTER_STAY_DURATION = 30000   # 30 seconds in milliseconds
 MONSTER_WARNING_DURATION = 10000  # 10 seconds in milliseconds
+MONSTER_LIFETIME = 10000  # Patrolling monsters despawn after this many ms
+MONSTER_THINK_RATE = 10  # AI decisions per second per monster
+MONSTER_THINK_BUDGET = 64  # Most AI decisions made in one frame, the rest wait a frame
+MONSTER_LOSE_SIGHT_TIME = 1500  # ms a chasing monster keeps going after losing sight of the player
+MONSTER_ATTACK_DISTANCE = 60
+MONSTER_HIDING_CHECK_CHANCE = 0.05  # Chance per think that a monster passing the player's hiding spot checks it
+MONSTER_BACKEND = 'sprites'  # 'numpy' simulates all monsters in one vectorized step (needs numpy)
+MAX_MONSTERS = 256  # Default cap on monsters alive at once, levels can lower it with "max_monsters"
+
+# Noise settings, loudness uses the same 0-100 scale as the player's noise level
+NOISE_CELL_SIZE = 80  # Cell size in pixels of the noise grid
+NOISE_FALLOFF = 10  # Loudness lost per cell a sound travels
+NOISE_DECAY = 50  # Loudness lost per second
+NOISE_EMIT_INTERVAL = 0.25  # Seconds between the sounds made by a moving player
+NOISE_HIDE_LOUDNESS = 60  # Sound of getting into or out of a hiding spot
 
 # Colors
 WHITE = (255, 255, 255)
 LIGHT_BLUE = (173, 216, 230)
 BLACK = (0, 0, 0)
+RED = (255, 0, 0)
 
 # Control keys
 KEY_LEFT = pygame.K_a
@@ -49,6 +102,8 @@ KEY_RUN = pygame.K_LSHIFT
 
 # Quick Time Event keys
 QTE_KEYS = [pygame.K_w, pygame.K_a, pygame.K_s, pygame.K_d, pygame.K_q, pygame.K_e]
+QTE_TIME_LIMIT = 2.0  # Seconds to press the key
+QTE_RESULT_DURATION = 0.75  # Seconds the result stays on screen
 
 # Load language data
 with open('localization.json', 'r', encoding='utf-8') as f:
@@ -62,3 +117,10 @@ def get_text(key):
 
 # Chat terminal settings
 CHAT_TERMINAL_IMAGE = 'assets/images/chat_terminal.png'
+CHAT_MODEL = "gpt-3.5-turbo"  # Set OPENAI_BASE_URL to use another OpenAI-compatible server
+CHAT_SYSTEM_PROMPT = "You are an AI assistant in a space survival horror game. Provide information and guidance to the player."
+CHAT_REFRESH_INTERVAL = 0.1  # Seconds between chat history rebuilds while a reply streams in
+CHAT_TOKEN_BUDGET = 1500  # Maximum prompt size sent with each chat request
+CHAT_KEEP_RECENT_MESSAGES = 4  # Latest messages that are never summarized away
+CHAT_SUMMARIZE = True  # Summarize old messages instead of just dropping them
+CHAT_SUMMARY_MAX_TOKENS = 150
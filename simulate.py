@@ -0,0 +1,132 @@
+"""Headless, fixed-timestep simulation of a level.
+
+Runs the Level/Player/Monster logic under the SDL dummy drivers on a
+FixedClock and never draws, so thousands of ticks run per second. Useful for
+soak tests and balance sweeps on machines without a display:
+
+    python simulate.py assets/levels/level1.json --ticks 100000 --seed 1
+"""
+import os
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import argparse
+import contextlib
+import io
+import json
+import random
+import time
+import pygame
+from settings import *
+import game_clock
+
+def init_headless():
+    pygame.init()
+    # convert()/convert_alpha() need a display surface, the dummy driver provides one
+    pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+
+class ScriptedKeys:
+    """Replacement for pygame.key.get_pressed() that plays back a looping key script.
+
+    ``script`` is a list of (duration in ms, keys held) steps, timed on the game clock.
+    """
+
+    def __init__(self, script):
+        self.script = script
+        self.length = sum(duration for duration, _ in script)
+
+    def __call__(self):
+        return self
+
+    def __getitem__(self, key):
+        return key in self.held()
+
+    def held(self):
+        position = game_clock.get_ticks() % self.length
+        for duration, keys in self.script:
+            if position < duration:
+                return keys
+            position -= duration
+        return ()
+
+# Walk left and right, sprint both ways, then stand still
+DEFAULT_SCRIPT = [
+    (2000, (KEY_LEFT,)),
+    (2000, (KEY_RIGHT,)),
+    (1000, (KEY_LEFT, KEY_RUN)),
+    (1000, (KEY_RIGHT, KEY_RUN)),
+    (1000, ()),
+]
+
+class HeadlessSimulation:
+    def __init__(self, level_file, step_ms=1000 // FPS, seed=None, script=None):
+        from level import Level
+
+        if seed is not None:
+            random.seed(seed)
+        self.clock = game_clock.FixedClock()
+        game_clock.set_clock(self.clock)
+        self.step_ms = step_ms
+        self.ticks = 0
+        self.deaths = 0
+        self.level = Level(level_file)
+        self.input = ScriptedKeys(script or DEFAULT_SCRIPT)
+        self.level.player.get_keys = self.input
+
+    def restart_level(self):
+        self.level.restart_level()
+        self.level.player.get_keys = self.input
+
+    def step(self, restart_on_death=False):
+        self.clock.advance(self.step_ms)
+        self.level.update(self.step_ms / 1000)
+        self.ticks += 1
+        if self.level.is_game_over and restart_on_death:
+            self.deaths += 1
+            self.restart_level()
+
+    def run(self, ticks, restart_on_death=False):
+        for _ in range(ticks):
+            self.step(restart_on_death)
+
+    def summary(self):
+        return {
+            'ticks': self.ticks,
+            'simulated_seconds': self.clock.get_ticks() / 1000,
+            'deaths': self.deaths + (1 if self.level.is_game_over else 0),
+            'player_health': self.level.player.health,
+            'monsters_alive': len(self.level.monsters),
+        }
+
+    def close(self):
+        self.level.cleanup()
+        game_clock.set_clock(game_clock.SystemClock())
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a level headless with a fixed timestep.")
+    parser.add_argument('level', nargs='?', default='assets/levels/level1.json')
+    parser.add_argument('--ticks', type=int, default=10000)
+    parser.add_argument('--step', type=int, default=1000 // FPS, help="timestep in milliseconds")
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--restart-on-death', action='store_true')
+    parser.add_argument('--verbose', action='store_true', help="keep the game's console output")
+    args = parser.parse_args()
+
+    init_headless()
+    output = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(io.StringIO())
+    with output:
+        simulation = HeadlessSimulation(args.level, step_ms=args.step, seed=args.seed)
+        start = time.perf_counter()
+        simulation.run(args.ticks, restart_on_death=args.restart_on_death)
+        elapsed = time.perf_counter() - start
+        simulation.close()
+
+    result = simulation.summary()
+    result['level'] = args.level
+    result['wall_seconds'] = round(elapsed, 3)
+    result['ticks_per_second'] = round(args.ticks / elapsed) if elapsed else None
+    print(json.dumps(result, indent=2))
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()
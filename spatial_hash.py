@@ -0,0 +1,86 @@
+from collections import defaultdict
+from settings import *
+
+class SpatialHash:
+    """Uniform grid of sprites, queried by rect.
+
+    Sprites are registered under a layer ('interactables', 'monsters', ...) and
+    stored in every cell their rect overlaps. Dynamic sprites are re-bucketed by
+    ``sync()`` only when they cross a cell boundary, and dropped once killed.
+    Cells are insertion-ordered dicts used as sets, so queries return sprites
+    in the same order on every run.
+    """
+
+    def __init__(self, cell_size=SPATIAL_HASH_CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells = defaultdict(dict)  # (layer, cell x, cell y) -> {sprite: None}
+        self.sprite_cells = {}  # sprite -> (layer, cell range)
+        self.dynamic = set()
+
+    def cell_range(self, rect):
+        size = self.cell_size
+        return (rect.left // size, rect.top // size,
+                (rect.right - 1) // size, (rect.bottom - 1) // size)
+
+    def cells_in_range(self, layer, cell_range):
+        left, top, right, bottom = cell_range
+        for cx in range(left, right + 1):
+            for cy in range(top, bottom + 1):
+                yield (layer, cx, cy)
+
+    def insert(self, sprite, layer, dynamic=False, cell_range=None):
+        # cell_range may be passed in when it was precomputed (see level_compiler.py)
+        if sprite in self.sprite_cells:
+            self.remove(sprite)
+        if cell_range is None:
+            cell_range = self.cell_range(sprite.rect)
+        for cell in self.cells_in_range(layer, cell_range):
+            self.cells[cell][sprite] = None
+        self.sprite_cells[sprite] = (layer, cell_range)
+        if dynamic:
+            self.dynamic.add(sprite)
+
+    def remove(self, sprite):
+        entry = self.sprite_cells.pop(sprite, None)
+        if entry is None:
+            return
+        layer, cell_range = entry
+        for cell in self.cells_in_range(layer, cell_range):
+            bucket = self.cells.get(cell)
+            if bucket is not None:
+                bucket.pop(sprite, None)
+                if not bucket:
+                    del self.cells[cell]
+        self.dynamic.discard(sprite)
+
+    def update(self, sprite):
+        entry = self.sprite_cells.get(sprite)
+        if entry is None:
+            return
+        if not sprite.alive():
+            self.remove(sprite)
+            return
+        layer, cell_range = entry
+        if self.cell_range(sprite.rect) != cell_range:
+            self.insert(sprite, layer, dynamic=sprite in self.dynamic)
+
+    def sync(self):
+        for sprite in list(self.dynamic):
+            self.update(sprite)
+
+    def query(self, rect, layer):
+        # Candidates in the cells covering rect, without duplicates; they do not necessarily collide with it
+        found = {}
+        for cell in self.cells_in_range(layer, self.cell_range(rect)):
+            bucket = self.cells.get(cell)
+            if bucket:
+                found.update(bucket)
+        return list(found)
+
+    def query_collisions(self, rect, layer):
+        return [sprite for sprite in self.query(rect, layer) if sprite.rect.colliderect(rect)]
+
+    def clear(self):
+        self.cells.clear()
+        self.sprite_cells.clear()
+        self.dynamic.clear()
@@ -0,0 +1,140 @@
+import pygame
+from collections import defaultdict
+from settings import *
+import game_clock
+import random
+from monster import Monster, RangedMonster, EnhancedMonster
+from monster_batch import MonsterBatch
+from monster_ai import ThinkScheduler
+
+MONSTER_CLASSES = {cls.__name__: cls for cls in (Monster, RangedMonster, EnhancedMonster)}
+
+class SpawnDirector:
+    """Decides when and which monsters appear in a level, and recycles them.
+
+    Without ``waves`` in the level data a random entry of ``monsters`` is spawned
+    every MONSTER_SPAWN_INTERVAL while no monster is alive. With waves, each
+    wave ({"delay": ms after the previous wave, "monsters": [{"type", "x", "y",
+    "count", "spacing"}]}) is spawned once its delay has passed. Spawns respect
+    ``max_monsters`` and the per-type ``monster_budget`` of the level.
+
+    Killed monsters go back to a per-type pool and are reset for the next
+    spawn, so frames and surfaces are never loaded again. Live monsters
+    think on ``think_scheduler``; with MONSTER_BACKEND = 'numpy' they are
+    moved and animated by a MonsterBatch.
+    """
+
+    def __init__(self, level):
+        self.level = level
+        level_data = level.level_data
+        self.max_alive = level_data.get('max_monsters', MAX_MONSTERS)
+        self.budgets = level_data.get('monster_budget', {})
+        self.waves = level_data.get('waves', [])
+        self.pool = defaultdict(list)  # monster type -> killed monsters ready for reuse
+        self.alive_by_type = defaultdict(int)
+        self.last_spawned = None
+        self.think_scheduler = ThinkScheduler()
+        self.batch = None
+        if MONSTER_BACKEND == 'numpy':
+            self.enable_batch()
+        self.load_frames()
+        self.reset()
+
+    def load_frames(self):
+        # Frames of every monster type the level can spawn are built while the level loads,
+        # from the sprite sheets the level loader decoded, not on the first spawn mid-game
+        entries = list(self.level.level_data.get('monsters', []))
+        for wave in self.waves:
+            entries += wave.get('monsters', [])
+        size = Monster.frame_size(self.level.player)
+        for monster_type in dict.fromkeys(entry['type'] for entry in entries):
+            if monster_type in MONSTER_CLASSES:
+                MONSTER_CLASSES[monster_type].load_frame_table(size)
+
+    def enable_batch(self):
+        try:
+            self.batch = MonsterBatch(spatial_index=self.level.spatial_index)
+        except ImportError as e:
+            print(f"Warning: {e}, using the per-sprite monster backend")
+            return
+        for monster in self.level.monsters:
+            self.batch.add(monster)
+            self.level.spatial_index.dynamic.discard(monster)
+
+    def reset(self):
+        for monster in self.level.monsters.sprites():
+            monster.kill()
+        self.think_scheduler.clear()
+        current_time = game_clock.get_ticks()
+        self.wave_index = 0
+        self.next_spawn_time = current_time + (self.waves[0].get('delay', 0) if self.waves else MONSTER_SPAWN_INTERVAL)
+        self.warning_shown = False
+
+    def can_spawn(self, monster_type):
+        if len(self.level.monsters) >= self.max_alive:
+            return False
+        budget = self.budgets.get(monster_type)
+        return budget is None or self.alive_by_type[monster_type] < budget
+
+    def spawn(self, monster_data):
+        monster_type = monster_data['type']
+        if monster_type not in MONSTER_CLASSES or not self.can_spawn(monster_type):
+            return None
+        position = (monster_data['x'], monster_data['y'])
+        groups = [self.level.visible_sprites, self.level.monsters]
+        if self.pool[monster_type]:
+            monster = self.pool[monster_type].pop()
+            monster.reset(position)
+            monster.add(*groups)
+        else:
+            monster = MONSTER_CLASSES[monster_type](position, groups, self.level.player)
+            monster.pool = self
+        self.alive_by_type[monster_type] += 1
+        # Batched monsters are re-bucketed by the batch when they move
+        self.level.spatial_index.insert(monster, 'monsters', dynamic=self.batch is None)
+        if self.batch is not None:
+            self.batch.add(monster)
+        self.think_scheduler.add(monster, game_clock.get_ticks())
+        self.last_spawned = monster
+        return monster
+
+    def release(self, monster):
+        # Called by Monster.kill
+        monster_type = type(monster).__name__
+        self.alive_by_type[monster_type] -= 1
+        self.pool[monster_type].append(monster)
+        self.level.spatial_index.remove(monster)
+        self.think_scheduler.remove(monster)
+        if self.batch is not None:
+            self.batch.remove(monster)
+
+    def spawn_wave(self, wave):
+        for entry in wave.get('monsters', []):
+            for i in range(entry.get('count', 1)):
+                self.spawn(dict(entry, x=entry['x'] + i * entry.get('spacing', 0)))
+
+    def update(self, current_time):
+        if self.waves:
+            if self.wave_index < len(self.waves) and current_time >= self.next_spawn_time:
+                self.spawn_wave(self.waves[self.wave_index])
+                self.wave_index += 1
+                if self.wave_index < len(self.waves):
+                    self.next_spawn_time = current_time + self.waves[self.wave_index].get('delay', 0)
+                self.warning_shown = False
+        elif len(self.level.monsters) == 0 and current_time >= self.next_spawn_time:
+            if self.level.level_data.get('monsters'):
+                self.spawn(random.choice(self.level.level_data['monsters']))
+            self.next_spawn_time = current_time + MONSTER_SPAWN_INTERVAL
+            self.warning_shown = False
+
+    def take_warning(self, current_time):
+        """Seconds until the next spawn when its warning should be shown now, otherwise None."""
+        if self.warning_shown or current_time < self.next_spawn_time - MONSTER_WARNING_DURATION:
+            return None
+        if self.waves:
+            if self.wave_index >= len(self.waves):
+                return None
+        elif len(self.level.monsters) or not self.level.level_data.get('monsters'):
+            return None
+        self.warning_shown = True
+        return max(self.next_spawn_time - current_time, 0) / 1000
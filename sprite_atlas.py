@@ -0,0 +1,110 @@
+import pygame
+import json
+import mmap
+import os
+from settings import *
+
+ATLAS_FORMAT = 'RGBA'
+ATLAS_VERSION = 1
+
+def source_stamp(path):
+    stat = os.stat(path)
+    return [stat.st_size, stat.st_mtime_ns]
+
+class SpriteAtlas:
+    """Pre-scaled sprite frames packed into one texture by build_atlas.py.
+
+    Entries are keyed by the same keys AssetCache uses, so a cache miss can be
+    served from the atlas without decoding the original PNG. Entries whose
+    source image changed since the atlas was built are ignored.
+    """
+
+    def __init__(self, index_path):
+        with open(index_path, 'r') as f:
+            index = json.load(f)
+        if index.get('version') != ATLAS_VERSION:
+            raise ValueError(f"unsupported atlas version {index.get('version')}")
+
+        data_path = os.path.join(os.path.dirname(index_path), index['texture'])
+        size = tuple(index['size'])
+        with open(data_path, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                # convert_alpha copies the pixels, so the mapping can be closed right away
+                self.texture = pygame.image.frombuffer(data, size, ATLAS_FORMAT).convert_alpha()
+
+        self.entries = {}
+        stale_sources = set()
+        for path, stamp in index['sources'].items():
+            if not os.path.exists(path) or source_stamp(path) != stamp:
+                stale_sources.add(path)
+        self.sources = set(index['sources']) - stale_sources  # Images whose frames are served from the atlas
+        for entry in index['entries']:
+            if entry['source'] in stale_sources:
+                continue
+            self.entries[entry['key']] = entry
+        if stale_sources:
+            print(f"Warning: sprite atlas is out of date for {len(stale_sources)} image(s), rebuild it with build_atlas.py")
+
+    def get(self, key):
+        entry = self.entries.get(repr(key))
+        if entry is None:
+            return None
+        surfaces = tuple(self.texture.subsurface(rect) for rect in entry['rects'])
+        return surfaces if entry['kind'] == 'frames' else surfaces[0]
+
+def pack_surfaces(surfaces, max_width=ATLAS_MAX_WIDTH, padding=1):
+    """Shelf-pack surfaces, tallest first. Returns (atlas width, atlas height, rects)."""
+    order = sorted(range(len(surfaces)), key=lambda i: surfaces[i].get_height(), reverse=True)
+    rects = [None] * len(surfaces)
+    x = y = shelf_height = width = 0
+    for i in order:
+        w, h = surfaces[i].get_size()
+        if w > max_width:
+            raise ValueError(f"sprite of width {w} does not fit into an atlas {max_width} pixels wide")
+        if x + w > max_width:
+            x = 0
+            y += shelf_height + padding
+            shelf_height = 0
+        rects[i] = (x, y, w, h)
+        x += w + padding
+        shelf_height = max(shelf_height, h)
+        width = max(width, x)
+    return width, y + shelf_height, rects
+
+def write_atlas(index_path, entries):
+    """Pack ``entries`` (key, source path, kind, surfaces) and write the texture and index."""
+    flat = [surface for _, _, _, surfaces in entries for surface in surfaces]
+    width, height, rects = pack_surfaces(flat)
+
+    texture = pygame.Surface((max(width, 1), max(height, 1)), pygame.SRCALPHA)
+    texture.fill((0, 0, 0, 0))
+    for surface, rect in zip(flat, rects):
+        texture.blit(surface, rect[:2])
+
+    index_entries = []
+    rect_iter = iter(rects)
+    for key, source, kind, surfaces in entries:
+        index_entries.append({
+            'key': repr(key),
+            'source': source,
+            'kind': kind,
+            'rects': [next(rect_iter) for _ in surfaces],
+        })
+
+    texture_name = os.path.splitext(os.path.basename(index_path))[0] + '.rgba'
+    directory = os.path.dirname(index_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, texture_name), 'wb') as f:
+        f.write(pygame.image.tobytes(texture, ATLAS_FORMAT))
+
+    index = {
+        'version': ATLAS_VERSION,
+        'texture': texture_name,
+        'size': [texture.get_width(), texture.get_height()],
+        'sources': {source: source_stamp(source) for _, source, _, _ in entries},
+        'entries': index_entries,
+    }
+    with open(index_path, 'w') as f:
+        json.dump(index, f, indent=2)
+    return texture.get_size()
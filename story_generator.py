@@ -1,16 +1,12 @@
 from langchain_core.prompts import PromptTemplate
 from langchain.chains import LLMChain
 from langchain_openai import OpenAI
+from response_cache import response_cache
 import os
 
 class StoryGenerator:
     def __init__(self):
-        # Get the OpenAI API key from environment variables
-        openai_api_key = os.getenv("OPENAI_API_KEY")
-        if not openai_api_key:
-            raise ValueError("OPENAI_API_KEY not found in environment variables")
-        
-        self.llm = OpenAI(temperature=0.7, openai_api_key=openai_api_key)
+        self.temperature = 0.7
         self.template = """
         Generate a short, engaging story for a space survival horror game. The story should include:
         1. A mysterious awakening on a space station
@@ -19,8 +15,23 @@ class StoryGenerator:
 
         Story:
         """
+        self.chain = None
+        if response_cache.replay_only:
+            return  # Offline: stories only come from the cache
+
+        # Get the OpenAI API key from environment variables
+        openai_api_key = os.getenv("OPENAI_API_KEY")
+        if not openai_api_key:
+            raise ValueError("OPENAI_API_KEY not found in environment variables")
+
+        self.llm = OpenAI(temperature=self.temperature, openai_api_key=openai_api_key)
         self.prompt = PromptTemplate(template=self.template, input_variables=[])
         self.chain = LLMChain(llm=self.llm, prompt=self.prompt)
 
     def generate_story(self):
-        return self.chain.run()
+        key = response_cache.key('story', 'langchain-openai', self.template, {'temperature': self.temperature})
+        story = response_cache.get_text(key)
+        if story is None:
+            story = self.chain.run()
+            response_cache.put_text(key, story)
+        return story
@@ -0,0 +1,101 @@
+import os
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import queue
+import socket
+import threading
+import time
+from http.server import ThreadingHTTPServer
+import pygame
+import pytest
+from openai import OpenAI
+from settings import *
+from fake_openai_server import FakeChatHandler
+from response_cache import response_cache
+
+REPLY = "Station AI here. You said: {}. Stay quiet and keep moving."
+
+@pytest.fixture
+def server(monkeypatch):
+    monkeypatch.setattr(FakeChatHandler, 'first_token_delay', 0.05)
+    monkeypatch.setattr(FakeChatHandler, 'token_delay', 0.01)
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FakeChatHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+@pytest.fixture
+def chat(server, monkeypatch):
+    monkeypatch.setenv('OPENAI_API_KEY', 'test')
+    monkeypatch.setenv('OPENAI_BASE_URL', f"http://127.0.0.1:{server.server_address[1]}/v1")
+    monkeypatch.setattr(response_cache, 'mode', 'off')
+    pygame.init()
+    from chat_terminal import ChatInterface
+    return ChatInterface(pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT)))
+
+def send(chat, message):
+    chat.input_field.set_text(message)
+    chat.send_message()
+
+def wait(chat, condition, timeout=10):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        chat.update(0.016)
+        time.sleep(0.005)
+    assert condition()
+
+def turns(chat):
+    return [(message['role'], message['content']) for message in chat.context.messages]
+
+def test_streams_the_answer(chat):
+    send(chat, "hello")
+    wait(chat, lambda: not chat.is_busy())
+    assert chat.request_metrics[-1]['status'] == 'done'
+    assert chat.request_metrics[-1]['chunks'] > 1
+    assert turns(chat) == [('user', "hello"), ('assistant', REPLY.format("hello"))]
+    assert REPLY.format("hello") in chat.history_html
+
+def test_cancel_keeps_turns_paired(chat, monkeypatch):
+    monkeypatch.setattr(FakeChatHandler, 'token_delay', 0.1)
+    send(chat, "first")
+    wait(chat, lambda: chat.pending_response)
+    chat.cancel_request()
+    assert chat.request_metrics[-1]['status'] == 'cancelled'
+    partial = turns(chat)[-1]
+    assert partial[0] == 'assistant' and REPLY.format("first").startswith(partial[1])
+
+    # The cancelled worker may still be winding down; none of its tokens reach the next answer
+    monkeypatch.setattr(FakeChatHandler, 'token_delay', 0.01)
+    send(chat, "second")
+    wait(chat, lambda: not chat.is_busy())
+    assert turns(chat)[2:] == [('user', "second"), ('assistant', REPLY.format("second"))]
+
+def test_cancel_before_the_answer_drops_the_message(chat, monkeypatch):
+    monkeypatch.setattr(FakeChatHandler, 'first_token_delay', 0.5)
+    send(chat, "never mind")
+    chat.cancel_request()
+    assert chat.request_metrics[-1]['status'] == 'cancelled'
+    assert turns(chat) == []
+
+def test_cancelled_request_makes_no_call(chat, monkeypatch):
+    calls = []
+    monkeypatch.setattr(chat.client.chat.completions, 'create', lambda **kwargs: calls.append(kwargs))
+    cancel_event = threading.Event()
+    cancel_event.set()
+    response_queue = queue.Queue()
+    chat.context.add("user", "hello")
+    chat.stream_ai_response(response_queue, cancel_event)
+    assert response_queue.get_nowait() == ('cancelled', None)
+    assert response_queue.empty() and calls == []
+
+def test_error_drops_the_message(chat):
+    # Nothing listens on a port that was just closed
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+    chat.client = OpenAI(api_key='test', base_url=f"http://127.0.0.1:{port}/v1", max_retries=0)
+    send(chat, "hello")
+    wait(chat, lambda: not chat.is_busy())
+    assert chat.request_metrics[-1]['status'] == 'error'
+    assert turns(chat) == []
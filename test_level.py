@@ -0,0 +1,75 @@
+import os
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import random
+import pygame
+import pytest
+import game_clock
+from settings import *
+
+@pytest.fixture
+def clock():
+    clock = game_clock.FixedClock()
+    game_clock.set_clock(clock)
+    yield clock
+    game_clock.set_clock(game_clock.SystemClock())
+
+@pytest.fixture
+def level(clock):
+    random.seed(1)
+    pygame.init()
+    pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+    from level import Level
+    return Level(START_LEVEL)
+
+def hide_in_shelf(level):
+    shelf = next(i for i in level.interactables if type(i).__name__ == 'Shelve')
+    level.player.rect.center = shelf.rect.center
+    level.player.hide(shelf)
+
+def send_monster(level, clock):
+    # A monster next to the hiding spot, walking up to check it
+    spot = level.player.hiding_spot.rect
+    monster = level.spawn_monster({'type': 'Monster', 'x': spot.centerx - 100, 'y': level.player.rect.y - 20})
+    monster.enter_state('check_hiding_spot', clock.get_ticks())
+    monster.target = spot.center
+    return monster
+
+def run(level, clock, seconds, until=None):
+    for _ in range(int(seconds * FPS)):
+        clock.advance(1000 // FPS)
+        level.update(1 / FPS)
+        if until and until():
+            return
+
+def key_down(key):
+    return pygame.event.Event(pygame.KEYDOWN, key=key)
+
+def test_no_quick_time_event_while_chatting(level, clock):
+    hide_in_shelf(level)
+    send_monster(level, clock)
+    level.show_chat_interface()
+    run(level, clock, 3)
+    assert not level.qte.is_active
+    level.handle_event(key_down(pygame.K_a))
+    assert level.player.is_hiding
+
+    level.hide_chat_interface()
+    send_monster(level, clock)
+    run(level, clock, 3, until=lambda: level.qte.is_active)
+    assert level.qte.is_active
+
+def test_quick_time_event_pauses_under_overlay(level, clock):
+    hide_in_shelf(level)
+    level.qte.start(send_monster(level, clock), pygame.K_w)
+    level.show_chat_interface()
+    run(level, clock, QTE_TIME_LIMIT * 2)
+    assert level.qte.is_active
+    level.handle_event(key_down(pygame.K_a))  # Typed into the chat
+    assert level.qte.is_active and level.player.is_hiding
+
+    level.hide_chat_interface()
+    level.handle_event(key_down(pygame.K_w))
+    assert level.qte.state == 'success'
+    assert level.player.is_hiding
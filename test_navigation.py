@@ -0,0 +1,52 @@
+import pygame
+from navigation import NavGrid
+
+def walk(grid, start, target, limit=50):
+    # Cells visited by following grid.step from start until it stops
+    position = start
+    cells = [grid.cell_at(position)]
+    for _ in range(limit):
+        step = grid.step(position, target)
+        if step is None:
+            break
+        position = (position[0] + step[0] * grid.cell_size, position[1] + step[1] * grid.cell_size)
+        cells.append(grid.cell_at(position))
+    return cells
+
+def test_wall_forces_detour(world, center, cell_size):
+    wall = pygame.Rect(2 * cell_size, 0, cell_size, 2 * cell_size)  # Column 2, rows 0 and 1
+    grid = NavGrid(world, [wall], [world], cell_size=cell_size)
+    cells = walk(grid, center(0, 0), center(4, 0))
+    assert cells[-1] == grid.cell_at(center(4, 0))
+    assert grid.cell_at(center(2, 2)) in cells
+    assert all(grid.open[cell] for cell in cells)
+
+def test_vertical_moves_only_in_zones(world, center, cell_size):
+    ladder = pygame.Rect(4 * cell_size, 0, cell_size, world.height)  # Column 4
+    grid = NavGrid(world, vertical_zones=[ladder], cell_size=cell_size)
+    cells = walk(grid, center(0, 0), center(0, 2))
+    assert cells[-1] == grid.cell_at(center(0, 2))
+    for cell, other in zip(cells, cells[1:]):
+        if abs(other - cell) == grid.columns:
+            assert cell % grid.columns == 4
+
+def test_unreachable_target(world, center, cell_size):
+    wall = pygame.Rect(2 * cell_size, 0, cell_size, world.height)  # Whole column 2
+    grid = NavGrid(world, [wall], [world], cell_size=cell_size)
+    assert grid.step(center(0, 1), center(4, 1)) is None
+    assert grid.step(center(4, 1), center(4, 1)) is None
+
+def test_track_finishes_over_several_calls(center, cell_size):
+    grid = NavGrid(pygame.Rect(0, 0, 100, 100), vertical_zones=[pygame.Rect(0, 0, 100, 100)], cell_size=cell_size)
+    player = center(7, 7)
+    calls = 0
+    while True:
+        grid.track(player, budget=5)
+        calls += 1
+        if grid.search is None:
+            break
+        assert grid.tracked_field is None
+    assert calls > 1
+    assert grid.tracked_cell == grid.cell_at(player)
+    assert grid.tracked_field == grid.field(grid.cell_at(player))
+    assert grid.builds == 1  # The second lookup came from the cache
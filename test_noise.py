@@ -0,0 +1,49 @@
+import pygame
+import pytest
+from settings import NOISE_FALLOFF, NOISE_DECAY
+from noise import NoiseField
+
+def test_loses_falloff_per_cell(world, center, cell_size):
+    noise = NoiseField(world, cell_size=cell_size)
+    noise.emit(center(0, 0), 100)
+    noise.update(0)
+    for column in range(5):
+        assert noise.level_at(center(column, 0)) == 100 - column * NOISE_FALLOFF
+    assert noise.level_at(center(1, 1)) == 100 - 2 * NOISE_FALLOFF
+    assert noise.source_at(center(4, 2)) == center(0, 0)
+
+def test_blocked_by_obstacles(world, center, cell_size):
+    wall = pygame.Rect(2 * cell_size, 0, cell_size, world.height)  # Whole column 2
+    noise = NoiseField(world, [wall], cell_size=cell_size)
+    noise.emit(center(0, 1), 100)
+    noise.update(0)
+    assert noise.level_at(center(1, 1)) == 100 - NOISE_FALLOFF
+    assert noise.level_at(center(3, 1)) == 0
+    assert noise.source_at(center(3, 1)) is None
+
+def test_goes_around_obstacles(world, center, cell_size):
+    wall = pygame.Rect(2 * cell_size, 0, cell_size, 2 * cell_size)  # Column 2, rows 0 and 1
+    noise = NoiseField(world, [wall], cell_size=cell_size)
+    noise.emit(center(1, 0), 100)
+    noise.update(0)
+    # Down to row 2, under the wall and back up: 6 cells instead of 2
+    assert noise.level_at(center(3, 0)) == 100 - 6 * NOISE_FALLOFF
+
+def test_decays_over_time(world, center, cell_size):
+    noise = NoiseField(world, cell_size=cell_size)
+    noise.emit(center(0, 0), 100)
+    noise.update(0)
+    noise.update(0.1)
+    assert noise.level_at(center(0, 0)) == pytest.approx(100 - NOISE_DECAY * 0.1)
+    noise.update(100 / NOISE_DECAY)
+    assert noise.level_at(center(0, 0)) == 0
+    assert not noise.levels and not noise.sources
+
+def test_louder_cell_stops_spread(world, center, cell_size):
+    noise = NoiseField(world, cell_size=cell_size)
+    noise.emit(center(0, 0), 100)
+    noise.update(0)
+    noise.emit(center(2, 0), 30)
+    noise.update(0)
+    assert noise.level_at(center(2, 0)) == 100 - 2 * NOISE_FALLOFF
+    assert noise.source_at(center(3, 0)) == center(0, 0)
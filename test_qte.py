@@ -0,0 +1,58 @@
+import pygame
+import pytest
+from settings import QTE_TIME_LIMIT, QTE_RESULT_DURATION
+from qte import QuickTimeEvent
+
+def key_down(key):
+    return pygame.event.Event(pygame.KEYDOWN, key=key)
+
+@pytest.fixture
+def results():
+    return []
+
+@pytest.fixture
+def qte(results):
+    return QuickTimeEvent(lambda result, source: results.append((result, source)))
+
+def test_right_key_succeeds(qte, results):
+    assert qte.start('monster', pygame.K_w)
+    assert qte.handle_event(key_down(pygame.K_w))
+    assert qte.state == 'success'
+    assert results == [('success', 'monster')]
+
+def test_wrong_key_fails(qte, results):
+    qte.start('monster', pygame.K_w)
+    assert qte.handle_event(key_down(pygame.K_a))
+    assert qte.state == 'failure'
+    assert results == [('failure', 'monster')]
+
+def test_escape_is_not_an_answer(qte, results):
+    qte.start('monster', pygame.K_w)
+    assert not qte.handle_event(key_down(pygame.K_ESCAPE))
+    assert qte.is_active
+    assert results == []
+
+def test_timeout(qte, results):
+    qte.start('monster', pygame.K_w)
+    qte.update(QTE_TIME_LIMIT / 2)
+    assert qte.is_active
+    qte.update(QTE_TIME_LIMIT / 2)
+    assert qte.state == 'timeout'
+    assert results == [('timeout', 'monster')]
+    assert not qte.handle_event(key_down(pygame.K_w))
+    assert len(results) == 1
+
+def test_back_to_idle_after_result(qte):
+    qte.start(target_key=pygame.K_w)
+    qte.handle_event(key_down(pygame.K_w))
+    qte.update(QTE_RESULT_DURATION / 2)
+    assert qte.state == 'success'
+    qte.update(QTE_RESULT_DURATION / 2)
+    assert qte.state == 'idle'
+    assert qte.start(target_key=pygame.K_a)
+
+def test_idle_ignores_keys(qte, results):
+    assert not qte.handle_event(key_down(pygame.K_w))
+    qte.update(1.0)
+    assert qte.state == 'idle'
+    assert results == []
@@ -0,0 +1,36 @@
+import pygame
+from settings import *
+from asset_cache import LRUCache
+
+class TextCache:
+    """Shared font registry and cache of rendered text surfaces.
+
+    Like the asset cache, returned surfaces are shared and must not be modified.
+    """
+
+    def __init__(self, max_entries=TEXT_CACHE_SIZE):
+        self.fonts = {}
+        self.cache = LRUCache(max_entries)
+
+    def get_font(self, name=None, size=36):
+        key = (name, size)
+        font = self.fonts.get(key)
+        if font is None:
+            font = pygame.font.Font(name, size)
+            self.fonts[key] = font
+        return font
+
+    def render(self, text, size, color, antialias=True, font_name=None):
+        key = (font_name, size, text, tuple(color), antialias)
+        surface = self.cache.get(key)
+        if surface is None:
+            surface = self.get_font(font_name, size).render(text, antialias, color)
+            self.cache.put(key, surface)
+        return surface
+
+    def stats(self):
+        stats = self.cache.stats()
+        stats['fonts'] = len(self.fonts)
+        return stats
+
+text_cache = TextCache()
@@ -0,0 +1,98 @@
+import pygame
+import os
+from settings import *
+from asset_cache import asset_cache, LRUCache
+
+class TileMap:
+    """Tiled level background drawn from pre-rendered chunks.
+
+    The map is a grid of tile indices into a tileset image (tiles numbered left
+    to right, top to bottom; -1 leaves the cell empty). Tiles are baked into
+    chunks of TILE_CHUNK_SIZE x TILE_CHUNK_SIZE tiles on first use and kept in
+    an LRU cache, so memory stays bounded however large the map is.
+    """
+
+    def __init__(self, tileset_path, tile_size, rows, chunk_size=TILE_CHUNK_SIZE, max_chunks=TILE_CHUNK_CACHE_SIZE):
+        self.tile_size = tile_size
+        self.rows = rows
+        self.chunk_size = chunk_size
+        self.chunk_pixels = chunk_size * tile_size
+        self.width = max((len(row) for row in rows), default=0) * tile_size
+        self.height = len(rows) * tile_size
+        self.tiles = self.load_tiles(tileset_path, tile_size)
+        self.chunks = LRUCache(max_chunks)
+
+    @classmethod
+    def from_level(cls, tiles_data):
+        return cls(os.path.join('assets', 'images', tiles_data['tileset']), tiles_data['tile_size'], tiles_data['map'])
+
+    def load_tiles(self, tileset_path, tile_size):
+        try:
+            tileset = asset_cache.get_image(tileset_path, alpha=False)
+        except (pygame.error, FileNotFoundError) as e:
+            print(f"Error loading tileset: {e}")
+            # Two-tone placeholder tiles
+            tiles = []
+            for color in ((40, 40, 40), (60, 60, 60)):
+                tile = pygame.Surface((tile_size, tile_size))
+                tile.fill(color)
+                tiles.append(tile)
+            return tiles
+        columns = tileset.get_width() // tile_size
+        return [tileset.subsurface((column * tile_size, row * tile_size, tile_size, tile_size))
+                for row in range(tileset.get_height() // tile_size)
+                for column in range(columns)]
+
+    def chunk_range(self, rect):
+        size = self.chunk_pixels
+        return range(max(rect.left, 0) // size, (min(rect.right, self.width) - 1) // size + 1), \
+            range(max(rect.top, 0) // size, (min(rect.bottom, self.height) - 1) // size + 1)
+
+    def get_chunk(self, chunk_x, chunk_y):
+        chunk = self.chunks.get((chunk_x, chunk_y))
+        if chunk is None:
+            chunk = self.render_chunk(chunk_x, chunk_y)
+            self.chunks.put((chunk_x, chunk_y), chunk)
+        return chunk
+
+    def render_chunk(self, chunk_x, chunk_y):
+        chunk = pygame.Surface((self.chunk_pixels, self.chunk_pixels)).convert()
+        chunk.fill((0, 0, 0))
+        first_row, first_column = chunk_y * self.chunk_size, chunk_x * self.chunk_size
+        blits = []
+        for row_index, row in enumerate(self.rows[first_row:first_row + self.chunk_size]):
+            for column_index, tile in enumerate(row[first_column:first_column + self.chunk_size]):
+                if 0 <= tile < len(self.tiles):
+                    blits.append((self.tiles[tile], (column_index * self.tile_size, row_index * self.tile_size)))
+        chunk.blits(blits, doreturn=False)
+        return chunk
+
+    def prefetch(self, view_rect, limit=1):
+        # Bake at most ``limit`` missing chunks around the view per call, so a
+        # fast-moving camera spreads the work over several frames
+        margin = self.chunk_pixels
+        columns, rows = self.chunk_range(view_rect.inflate(margin * 2, margin * 2))
+        for chunk_y in rows:
+            for chunk_x in columns:
+                if limit <= 0:
+                    return
+                if (chunk_x, chunk_y) not in self.chunks.entries:
+                    self.chunks.put((chunk_x, chunk_y), self.render_chunk(chunk_x, chunk_y))
+                    limit -= 1
+
+    def draw(self, surface, camera, area=None):
+        # ``area`` is in screen coordinates, the whole viewport by default
+        view = camera.rect if area is None else camera.to_world(pygame.Rect(area))
+        if area is None:
+            surface.fill((0, 0, 0))
+        else:
+            surface.fill((0, 0, 0), area)
+        size = self.chunk_pixels
+        columns, rows = self.chunk_range(view)
+        for chunk_y in rows:
+            for chunk_x in columns:
+                chunk_rect = pygame.Rect(chunk_x * size, chunk_y * size, size, size)
+                visible = chunk_rect.clip(view)
+                if visible:
+                    surface.blit(self.get_chunk(chunk_x, chunk_y), camera.apply(visible),
+                                 visible.move(-chunk_rect.x, -chunk_rect.y))
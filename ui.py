@@ -1,36 +1,101 @@
 import pygame
+import settings
 from settings import *
+import game_clock
+from text_cache import text_cache
 
 class UI:
+    """HUD drawn from cached panel surfaces.
+
+    Each panel is re-rendered only when the player values it shows (or the
+    language) change; otherwise the cached surface is blitted as is.
+    """
+
     def __init__(self, player):
         self.player = player
-        self.font = pygame.font.Font(None, 36)
+        self.panels = {}  # name -> (state key, surface)
+
+        # Rebuild statistics
+        self.rebuild_count = 0
+        self.rebuilds_per_second = 0
+        self.rebuild_count_time = game_clock.get_ticks()
+        self.rebuild_count_at_time = 0
 
     def draw(self, screen):
+        # Returns (rect, state key) for every panel drawn, for dirty-rect rendering
+        drawn = []
+        lang = settings.CURRENT_LANG
+
+        drawn.append(self.draw_panel(screen, 'stats', (10, 10),
+                                     (self.player.health, int(self.player.stamina), self.player.noise_level, lang),
+                                     self.render_stats))
+        drawn.append(self.draw_panel(screen, 'inventory', (WINDOW_WIDTH - 110, WINDOW_HEIGHT - 40),
+                                     (len(self.player.inventory),), self.render_inventory))
+        drawn.append(self.draw_panel(screen, 'notes', (10, WINDOW_HEIGHT - 40),
+                                     (bool(self.player.notes),), self.render_notes))
+
+        self.update_rebuild_stats()
+        if SHOW_PERF_STATS:
+            drawn.append(self.draw_panel(screen, 'perf', (40, WINDOW_HEIGHT - 38),
+                                         (self.rebuilds_per_second,), self.render_perf, count=False))
+        return drawn
+
+    def draw_panel(self, screen, name, position, key, render, count=True):
+        cached = self.panels.get(name)
+        if cached is None or cached[0] != key:
+            cached = (key, render())
+            self.panels[name] = cached
+            if count:
+                self.rebuild_count += 1
+        return screen.blit(cached[1], position), key
+
+    def update_rebuild_stats(self):
+        current_time = game_clock.get_ticks()
+        if current_time - self.rebuild_count_time >= 1000:
+            self.rebuilds_per_second = self.rebuild_count - self.rebuild_count_at_time
+            self.rebuild_count_at_time = self.rebuild_count
+            self.rebuild_count_time = current_time
+
+    def render_stats(self):
+        health_text = text_cache.render(f"{get_text('health')}: {self.player.health}", 36, WHITE)
+        stamina_text = text_cache.render(f"{get_text('stamina')}: {int(self.player.stamina)}", 36, LIGHT_BLUE)
+        noise_color = (255, 255 - self.player.noise_level * 2.55, 255 - self.player.noise_level * 2.55)
+        noise_text = text_cache.render(f"{get_text('noise')}: {self.player.noise_level}", 36, noise_color)
+
+        width = max(110 + health_text.get_width(), 110 + stamina_text.get_width(), noise_text.get_width())
+        height = 60 + noise_text.get_height()
+        panel = pygame.Surface((width, height), pygame.SRCALPHA)
+
         # Draw health bar
-        health_text = self.font.render(f"{get_text('health')}: {self.player.health}", True, WHITE)
-        pygame.draw.rect(screen, WHITE, (10, 10, 100, 20), 0)
-        pygame.draw.rect(screen, BLACK, (10, 10, 100 * (self.player.health / PLAYER_HEALTH), 20), 0)
-        screen.blit(health_text, (120, 10))
+        pygame.draw.rect(panel, WHITE, (0, 0, 100, 20), 0)
+        pygame.draw.rect(panel, BLACK, (0, 0, 100 * (self.player.health / PLAYER_HEALTH), 20), 0)
+        panel.blit(health_text, (110, 0))
 
         # Draw stamina bar
-        stamina_text = self.font.render(f"{get_text('stamina')}: {int(self.player.stamina)}", True, LIGHT_BLUE)
-        pygame.draw.rect(screen, LIGHT_BLUE, (10, 40, 100, 20), 0)
-        pygame.draw.rect(screen, BLACK, (10, 40, 100 * (self.player.stamina / PLAYER_STAMINA), 20), 0)
-        screen.blit(stamina_text, (120, 40))
+        pygame.draw.rect(panel, LIGHT_BLUE, (0, 30, 100, 20), 0)
+        pygame.draw.rect(panel, BLACK, (0, 30, 100 * (self.player.stamina / PLAYER_STAMINA), 20), 0)
+        panel.blit(stamina_text, (110, 30))
 
         # Draw noise level
-        noise_color = (255, 255 - self.player.noise_level * 2.55, 255 - self.player.noise_level * 2.55)
-        noise_text = self.font.render(f"{get_text('noise')}: {self.player.noise_level}", True, noise_color)
-        screen.blit(noise_text, (10, 70))
+        panel.blit(noise_text, (0, 60))
+        return panel
 
+    def render_inventory(self):
+        panel = pygame.Surface((95, 20), pygame.SRCALPHA)
         # Draw inventory slots
         for i in range(4):
-            pygame.draw.rect(screen, WHITE, (WINDOW_WIDTH - 110 + i * 25, WINDOW_HEIGHT - 40, 20, 20), 1)
+            pygame.draw.rect(panel, WHITE, (i * 25, 0, 20, 20), 1)
             if i < len(self.player.inventory):
-                pygame.draw.rect(screen, WHITE, (WINDOW_WIDTH - 108 + i * 25, WINDOW_HEIGHT - 38, 16, 16), 0)
+                pygame.draw.rect(panel, WHITE, (2 + i * 25, 2, 16, 16), 0)
+        return panel
 
+    def render_notes(self):
+        panel = pygame.Surface((20, 20), pygame.SRCALPHA)
         # Draw notes icon
-        pygame.draw.rect(screen, WHITE, (10, WINDOW_HEIGHT - 40, 20, 20), 1)
+        pygame.draw.rect(panel, WHITE, (0, 0, 20, 20), 1)
         if self.player.notes:
-            pygame.draw.rect(screen, WHITE, (12, WINDOW_HEIGHT - 38, 16, 16), 0)
+            pygame.draw.rect(panel, WHITE, (2, 2, 16, 16), 0)
+        return panel
+
+    def render_perf(self):
+        return text_cache.render(f"HUD rebuilds/s: {self.rebuilds_per_second}", 24, WHITE)
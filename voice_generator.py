@@ -1,20 +1,43 @@
 from elevenlabs.client import ElevenLabs
+from response_cache import response_cache
 import os
 
 class VoiceGenerator:
     def __init__(self):
+        self.voice = "Josh"
+        self.model = "eleven_monolingual_v1"
+        self.client = None
+        if response_cache.replay_only:
+            return  # Offline: voices only come from the cache
+
         self.api_key = os.environ.get("ELEVENLABS_API_KEY")
         if not self.api_key:
             raise ValueError("ELEVENLABS_API_KEY environment variable is not set")
         self.client = ElevenLabs(api_key=self.api_key)
 
     def generate_voice(self, text, filename):
+        """Return the path of an mp3 with ``text`` spoken.
+
+        Cached voices are returned from the response cache and must not be deleted
+        by the caller, ``filename`` is only written when the cache is off.
+        """
+        key = response_cache.key('voice', self.model, text, {'voice': self.voice})
+        cached = response_cache.get_file(key, '.mp3')
+        if cached:
+            return cached
+
         audio = self.client.generate(
             text=text,
-            voice="Josh",
-            model="eleven_monolingual_v1"
+            voice=self.voice,
+            model=self.model
         )
-        
+        if not isinstance(audio, bytes):
+            audio = b"".join(audio)  # Newer clients return the audio as a stream of chunks
+
+        cached = response_cache.put_bytes(key, audio, '.mp3')
+        if cached:
+            return cached
+
         with open(filename, "wb") as f:
             f.write(audio)
         